@@ -0,0 +1,64 @@
+import json
+import subprocess
+import sys
+
+# Provider SDKs that must stay out of the import of app.main
+HEAVY_MODULES = [
+    "langchain",
+    "langchain_core",
+    "langchain_groq",
+    "langchain_google_genai",
+    "langchain_openai",
+    "google.genai",
+    "groq",
+    "openai",
+]
+
+# Runs in a fresh interpreter so nothing is already imported
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+response = app.main.health_check()
+answered = time.perf_counter()
+print(json.dumps({
+    "import_seconds": imported - started,
+    "health_check_seconds": answered - imported,
+    "status_code": response.status_code,
+    "loaded": [name for name in HEAVY_MODULES if name in sys.modules],
+}))
+"""
+
+
+def measure_startup() -> dict:
+    """Imports app.main in a subprocess and reports import time, health check time and leaked SDKs."""
+    code = f"HEAVY_MODULES = {HEAVY_MODULES!r}\n{_PROBE}"
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(args):
+    budget = float(args[0]) if args else 2.0
+    result = measure_startup()
+    print(f"import app.main: {result['import_seconds']:.3f}s, "
+          f"health check: {result['health_check_seconds'] * 1000:.2f}ms")
+
+    failures = []
+    if result["loaded"]:
+        failures.append(f"provider SDKs imported at startup: {', '.join(result['loaded'])}")
+    if result["import_seconds"] > budget:
+        failures.append(f"import took {result['import_seconds']:.3f}s, budget is {budget:.1f}s")
+    if result["status_code"] != 200:
+        failures.append(f"health check returned {result['status_code']}")
+
+    if failures:
+        raise SystemExit("; ".join(failures))
+    print("Health check is answerable without loading any provider SDK.")
+
+
+if __name__ == "__main__":
+    # python -m app.benchmarks.startup [budget_seconds]
+    main(sys.argv[1:])
@@ -22,5 +22,95 @@ class Config(BaseSettings):
     RAPID_API_KEY: str
     SUPADATA_API_KEY: str
 
+    # HTTP response compression (bodies below the minimum size are sent as-is)
+    RESPONSE_COMPRESSION_MIN_SIZE: int = 1024
+    GZIP_COMPRESSION_LEVEL: int = 6
+    ZSTD_COMPRESSION_LEVEL: int = 3
+
+    # MongoDB connection pool. Compressors are tried in order; ones whose
+    # library is not installed are skipped.
+    MONGO_MAX_POOL_SIZE: int = 100
+    MONGO_MIN_POOL_SIZE: int = 5
+    MONGO_MAX_IDLE_TIME_MS: int = 5 * 60 * 1000
+    MONGO_CONNECT_TIMEOUT_MS: int = 5000
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 10000
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = 10000
+    MONGO_COMPRESSORS: str = "zstd,snappy,zlib"
+
+    # Authenticated principal cache. AUTH_TRUST_TOKEN_CLAIMS lets read-only routes
+    # skip the user lookup and trust the signed JWT claims instead.
+    PRINCIPAL_CACHE_SIZE: int = 4096
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    AUTH_TRUST_TOKEN_CLAIMS: bool = False
+
+    # Password hashing (0 workers = one per CPU core)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 0
+
+    # Outbound HTTP client
+    HTTP_TIMEOUT_SECONDS: float = 60.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 10
+
+    # LLM client pools. The warm-up imports provider SDKs in the background after startup.
+    LLM_WARMUP_ON_STARTUP: bool = True
+    LLM_MAX_CONNECTIONS: int = 50
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 10
+
+    # Transcript cache
+    TRANSCRIPT_CACHE_SIZE: int = 256
+    TRANSCRIPT_CACHE_TTL_SECONDS: int = 7 * 24 * 60 * 60
+
+    # LLM response cache
+    LLM_RESPONSE_CACHE_SIZE: int = 512
+    LLM_RESPONSE_CACHE_TTL_SECONDS: int = 24 * 60 * 60
+    LLM_RESPONSE_CACHE_USE_MONGO: bool = True
+
+    # Quiz document cache
+    QUIZ_CACHE_SIZE: int = 512
+    QUIZ_CACHE_TTL_SECONDS: int = 10 * 60
+
+    # Pre-flight token counting. Over-budget inputs are sampled in this many even sections.
+    TOKENIZER_ENCODING: str = "cl100k_base"
+    TOKEN_BUDGET_SECTIONS: int = 20
+
+    # Chunked (map-reduce) summaries for content over the summary model's input_token_budget
+    SUMMARY_CHUNK_SIZE_CHARS: int = 64000
+    SUMMARY_CHUNK_OVERLAP_CHARS: int = 1000
+    SUMMARY_MAP_CONCURRENCY: int = 4
+    SUMMARY_MAX_REDUCE_ROUNDS: int = 2
+    # Streamed output is re-parsed once this many new characters have arrived
+    SUMMARY_STREAM_PARSE_CHARS: int = 256
+
+    # YouTube audio pipeline (yt-dlp piped into ffmpeg, run in a process pool)
+    AUDIO_WORKERS: int = 2
+    AUDIO_MAX_SIZE_BYTES: int = 19_000_000
+    AUDIO_MIN_BITRATE_K: int = 16
+    AUDIO_MAX_BITRATE_K: int = 64
+    AUDIO_METADATA_TIMEOUT_SECONDS: int = 60
+    AUDIO_PIPELINE_TIMEOUT_SECONDS: int = 15 * 60
+    # Longer videos are split into windows of at most AUDIO_SEGMENT_SECONDS, processed concurrently
+    AUDIO_SEGMENT_THRESHOLD_SECONDS: int = 20 * 60
+    AUDIO_SEGMENT_SECONDS: int = 10 * 60
+    AUDIO_SEGMENT_CONCURRENCY: int = 4
+    # YouTube quizzes fall back to Gemini listening to the audio when Supadata reports the
+    # video has no transcript. Off by default: the fallback runs yt-dlp, ffmpeg and Gemini
+    # inside the request and can take minutes.
+    QUIZ_AUDIO_FALLBACK: bool = False
+
+    # Uploaded Gemini audio is reused until this close to its expiry
+    GEMINI_FILE_REUSE_MARGIN_SECONDS: int = 60 * 60
+
+    # Store the graded breakdown on each quiz attempt
+    ATTEMPT_RESULT_SNAPSHOTS: bool = True
+
+    # Background jobs
+    JOB_WORKERS: int = 2
+    JOB_LEASE_SECONDS: int = 300
+    JOB_POLL_INTERVAL_SECONDS: float = 2.0
+    JOB_MAX_ATTEMPTS: int = 2
+
 
 config = Config()
@@ -0,0 +1,61 @@
+import asyncio
+from pymongo import UpdateOne
+from app.db.mongodb import get_database
+
+
+async def backfill_quiz_stats(batch_size: int = 500) -> int:
+    """
+    One-off backfill of the denormalized quiz fields (attempt_count, questions_count,
+    last_attempted_at, best_score) from existing quiz_attempts. Values are set
+    absolutely, so the routine is safe to re-run. Run it during low traffic, since
+    attempts submitted while it runs can be overwritten by the recomputed totals.
+    Returns the number of quizzes updated from attempt history.
+    """
+    db = get_database()
+
+    # Defaults for quizzes created before the fields existed. questions_count has its own
+    # filter: a legacy quiz attempted before this runs already has attempt_count from $inc.
+    await db.quizzes.update_many(
+        {"questions_count": {"$exists": False}},
+        [{"$set": {"questions_count": {"$size": {"$ifNull": ["$questions", []]}}}}]
+    )
+    await db.quizzes.update_many(
+        {"attempt_count": {"$exists": False}},
+        {"$set": {"attempt_count": 0, "last_attempted_at": None, "best_score": None}}
+    )
+
+    pipeline = [
+        {"$group": {
+            "_id": "$quiz_id",
+            "attempt_count": {"$sum": 1},
+            "last_attempted_at": {"$max": "$attempted_at"},
+            "best_score": {"$max": "$marks_obtained"},
+        }}
+    ]
+
+    updated = 0
+    operations = []
+    async for stats in db.quiz_attempts.aggregate(pipeline, allowDiskUse=True):
+        operations.append(UpdateOne(
+            {"quiz_id": stats["_id"]},
+            {"$set": {
+                "attempt_count": stats["attempt_count"],
+                "last_attempted_at": stats["last_attempted_at"],
+                "best_score": stats["best_score"],
+            }}
+        ))
+        if len(operations) >= batch_size:
+            result = await db.quizzes.bulk_write(operations, ordered=False)
+            updated += result.modified_count
+            operations = []
+
+    if operations:
+        result = await db.quizzes.bulk_write(operations, ordered=False)
+        updated += result.modified_count
+
+    return updated
+
+
+if __name__ == "__main__":
+    # python -m app.db.backfill_quiz_stats
+    print(f"Backfilled attempt stats for {asyncio.run(backfill_quiz_stats())} quizzes")
@@ -0,0 +1,63 @@
+import asyncio
+from app.db.mongodb import get_database
+from app.services.mistakes_transcript import build_mistake_docs
+
+
+async def backfill_user_mistakes(batch_size: int = 500) -> int:
+    """
+    One-off materialization of user_mistakes from quiz_attempts recorded before the
+    collection existed, so practice quizzes see a user's whole mistake history and not
+    only what was recorded after the switch. Attempts that already have mistake
+    documents are skipped, so the routine is safe to re-run.
+    Returns the number of mistake documents inserted.
+    """
+    db = get_database()
+    inserted = 0
+
+    async def flush(attempts: list) -> int:
+        attempt_ids = [attempt["attempt_id"] for attempt in attempts]
+        done = set(await db.user_mistakes.distinct("attempt_id", {"attempt_id": {"$in": attempt_ids}}))
+        pending = [attempt for attempt in attempts if attempt["attempt_id"] not in done]
+        if not pending:
+            return 0
+
+        quiz_ids = list({attempt["quiz_id"] for attempt in pending})
+        quizzes = {
+            quiz["quiz_id"]: quiz
+            async for quiz in db.quizzes.find(
+                {"quiz_id": {"$in": quiz_ids}}, {"_id": 0, "quiz_id": 1, "questions": 1}
+            )
+        }
+
+        mistake_docs = []
+        for attempt in pending:
+            quiz = quizzes.get(attempt["quiz_id"])
+            if quiz:
+                mistake_docs.extend(build_mistake_docs(
+                    attempt["user_id"], quiz, attempt.get("responses", []),
+                    attempt["attempt_id"], attempt["attempted_at"]
+                ))
+        if not mistake_docs:
+            return 0
+        await db.user_mistakes.insert_many(mistake_docs, ordered=False)
+        return len(mistake_docs)
+
+    batch = []
+    async for attempt in db.quiz_attempts.find(
+        {"responses.is_correct": False},
+        {"_id": 0, "attempt_id": 1, "quiz_id": 1, "user_id": 1, "attempted_at": 1, "responses": 1}
+    ):
+        batch.append(attempt)
+        if len(batch) >= batch_size:
+            inserted += await flush(batch)
+            batch = []
+
+    if batch:
+        inserted += await flush(batch)
+
+    return inserted
+
+
+if __name__ == "__main__":
+    # python -m app.db.backfill_user_mistakes
+    print(f"Backfilled {asyncio.run(backfill_user_mistakes())} mistakes from attempt history")
@@ -0,0 +1,168 @@
+import asyncio
+import sys
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import PyMongoError
+from app.db.mongodb import get_database
+
+# collection -> list of (keys, options). create_index is a no-op when the index already exists.
+INDEXES = {
+    "users": [
+        ([("email", ASCENDING)], {"unique": True}),
+        ([("user_id", ASCENDING)], {"unique": True}),
+    ],
+    "quizzes": [
+        ([("quiz_id", ASCENDING)], {"unique": True}),
+        # Keyset-paginates /quiz/myquizzes. The attempt counters are deliberately left out:
+        # they change on every attempt, and indexing them would rewrite this index each time.
+        (
+            [("created_by", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            {"name": "quizzes_list_keyset"},
+        ),
+    ],
+    "quiz_attempts": [
+        ([("attempt_id", ASCENDING)], {"unique": True}),
+        (
+            [("quiz_id", ASCENDING), ("user_id", ASCENDING), ("attempted_at", DESCENDING), ("_id", DESCENDING)],
+            {},
+        ),
+        ([("user_id", ASCENDING), ("attempted_at", DESCENDING)], {}),
+    ],
+    "user_mistakes": [
+        ([("user_id", ASCENDING), ("attempted_at", DESCENDING)], {}),
+        ([("quiz_id", ASCENDING)], {}),
+        # Lets backfill_user_mistakes skip attempts that are already materialized
+        ([("attempt_id", ASCENDING)], {}),
+    ],
+    "summaries": [
+        ([("summary_id", ASCENDING)], {"unique": True}),
+        ([("created_by", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], {}),
+    ],
+    "jobs": [
+        ([("job_id", ASCENDING)], {"unique": True}),
+        ([("status", ASCENDING), ("created_at", ASCENDING)], {}),
+        (
+            [("user_id", ASCENDING), ("idempotency_key", ASCENDING)],
+            {"unique": True, "partialFilterExpression": {"idempotency_key": {"$type": "string"}}},
+        ),
+    ],
+    "transcripts": [
+        ([("video_id", ASCENDING)], {"unique": True}),
+        ([("expires_at", ASCENDING)], {"expireAfterSeconds": 0}),
+    ],
+    "gemini_files": [
+        ([("video_id", ASCENDING)], {"unique": True}),
+        ([("expires_at", ASCENDING)], {"expireAfterSeconds": 0}),
+    ],
+    "gemini_file_segments": [
+        (
+            [("video_id", ASCENDING), ("segment_seconds", ASCENDING), ("segment_index", ASCENDING)],
+            {"unique": True},
+        ),
+        ([("expires_at", ASCENDING)], {"expireAfterSeconds": 0}),
+    ],
+    "llm_response_cache": [
+        ([("key", ASCENDING)], {"unique": True}),
+        ([("expires_at", ASCENDING)], {"expireAfterSeconds": 0}),
+    ],
+}
+
+# collection -> index names that were replaced and are dropped if still present
+OBSOLETE_INDEXES = {
+    # Included the attempt counters, so every attempt submit rewrote it
+    "quizzes": ["quizzes_list_keyset_covering"],
+}
+
+# (collection, filter, sort) for the queries the routers and services run
+KNOWN_QUERIES = [
+    ("users", {"email": "x"}, None),
+    ("users", {"user_id": "x"}, None),
+    ("quizzes", {"quiz_id": "x"}, None),
+    ("quizzes", {"quiz_id": "x", "created_by": "x"}, None),
+    ("quizzes", {"created_by": "x"}, [("created_at", DESCENDING), ("_id", DESCENDING)]),
+    ("quiz_attempts", {"attempt_id": "x", "user_id": "x"}, None),
+    ("quiz_attempts", {"quiz_id": "x", "user_id": "x"}, [("attempted_at", DESCENDING), ("_id", DESCENDING)]),
+    ("quiz_attempts", {"user_id": "x", "responses.is_correct": False}, [("attempted_at", DESCENDING)]),
+    ("user_mistakes", {"user_id": "x"}, [("attempted_at", DESCENDING)]),
+    ("user_mistakes", {"quiz_id": "x"}, None),
+    ("user_mistakes", {"attempt_id": {"$in": ["x"]}}, None),
+    ("summaries", {"summary_id": "x", "created_by": "x"}, None),
+    ("summaries", {"created_by": "x"}, [("created_at", DESCENDING), ("_id", DESCENDING)]),
+    ("jobs", {"job_id": "x", "user_id": "x"}, None),
+    ("jobs", {"status": "queued"}, [("created_at", ASCENDING)]),
+    ("transcripts", {"video_id": "x"}, None),
+    ("gemini_files", {"video_id": "x", "expires_at": {"$gt": 0}}, None),
+    ("gemini_file_segments", {"video_id": "x", "segment_seconds": 0, "expires_at": {"$gt": 0}},
+     [("segment_index", ASCENDING)]),
+    ("gemini_file_segments", {"video_id": "x", "segment_seconds": 0, "segment_index": {"$gte": 0}}, None),
+    ("gemini_file_segments", {"video_id": "x"}, None),
+    ("llm_response_cache", {"key": "x"}, None),
+]
+
+
+async def ensure_indexes():
+    """
+    Creates every index in INDEXES and drops those in OBSOLETE_INDEXES. A failure on
+    one index (e.g. duplicate data blocking a unique index) is logged and does not stop the others.
+    """
+    db = get_database()
+    for collection, names in OBSOLETE_INDEXES.items():
+        existing = await db[collection].index_information()
+        for name in names:
+            if name not in existing:
+                continue
+            try:
+                await db[collection].drop_index(name)
+            except PyMongoError as e:
+                print(f"Warning: could not drop index {name} on '{collection}': {e}")
+    for collection, specs in INDEXES.items():
+        for keys, options in specs:
+            try:
+                await db[collection].create_index(keys, **options)
+            except PyMongoError as e:
+                print(f"Warning: could not create index {keys} on '{collection}': {e}")
+
+
+def _plan_stages(plan):
+    """Yields every stage name in an explain plan tree."""
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from _plan_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _plan_stages(item)
+
+
+async def find_collscan_queries() -> list:
+    """Explains every known query and returns the ones whose winning plan is a COLLSCAN."""
+    db = get_database()
+    offenders = []
+    for collection, query, sort in KNOWN_QUERIES:
+        cursor = db[collection].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        explain = await cursor.explain()
+        winning_plan = explain.get("queryPlanner", {}).get("winningPlan", {})
+        if "COLLSCAN" in set(_plan_stages(winning_plan)):
+            offenders.append({"collection": collection, "filter": query, "sort": sort})
+    return offenders
+
+
+async def check_query_plans():
+    """Raises RuntimeError if any known query falls back to a collection scan."""
+    offenders = await find_collscan_queries()
+    if offenders:
+        raise RuntimeError(f"Queries without a supporting index: {offenders}")
+
+
+async def _main(args):
+    await ensure_indexes()
+    if "--check" in args:
+        await check_query_plans()
+        print("All known queries use an index.")
+
+
+if __name__ == "__main__":
+    # python -m app.db.indexes [--check]
+    asyncio.run(_main(sys.argv[1:]))
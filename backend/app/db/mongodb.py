@@ -1,21 +1,65 @@
+import asyncio
+import importlib.util
+from typing import Optional
 from motor.motor_asyncio import AsyncIOMotorClient
-import os
-from dotenv import load_dotenv
+from app.config import config
 
-load_dotenv()
+DATABASE_NAME = "learnscribe"
 
-MONGO_URI = os.getenv("MONGO_URI")
+# compressor name -> module it needs; pymongo only warns and drops a missing one
+_COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
 
-# Async MongoDB Client
-client = AsyncIOMotorClient(MONGO_URI)
-db = client.learnscribe
+client: Optional[AsyncIOMotorClient] = None
+
+
+def _available_compressors() -> list:
+    requested = [name.strip() for name in config.MONGO_COMPRESSORS.split(",") if name.strip()]
+    return [
+        name for name in requested
+        if name in _COMPRESSOR_MODULES and importlib.util.find_spec(_COMPRESSOR_MODULES[name]) is not None
+    ]
+
+
+def _build_client() -> AsyncIOMotorClient:
+    options = {
+        "maxPoolSize": config.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": config.MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": config.MONGO_MAX_IDLE_TIME_MS,
+        "connectTimeoutMS": config.MONGO_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "waitQueueTimeoutMS": config.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+    }
+    compressors = _available_compressors()
+    if compressors:
+        options["compressors"] = compressors
+    return AsyncIOMotorClient(config.MONGO_URI, **options)
+
+
+async def connect_to_mongo():
+    """
+    Creates the client and opens MONGO_MIN_POOL_SIZE connections up front so the
+    first requests do not pay for the handshakes. Called from the app lifespan.
+    """
+    global client
+    if client is None:
+        client = _build_client()
+    warm = max(1, config.MONGO_MIN_POOL_SIZE)
+    await asyncio.gather(*(client.admin.command("ping") for _ in range(warm)))
+    print(f"Connected to MongoDB (pool {config.MONGO_MIN_POOL_SIZE}-{config.MONGO_MAX_POOL_SIZE}, "
+          f"compressors: {', '.join(_available_compressors()) or 'none'})")
 
 
 def get_database():
-    """Returns the MongoDB database instance."""
-    return db
+    """Returns the MongoDB database instance, creating the client lazily outside of the app lifespan."""
+    global client
+    if client is None:
+        client = _build_client()
+    return client[DATABASE_NAME]
 
 
 def close_mongo_connection():
     """Closes the MongoDB connection."""
-    client.close()
+    global client
+    if client is not None:
+        client.close()
+        client = None
@@ -1,6 +1,12 @@
 MODEL_CONFIGS = {
+    # input_token_budget caps the formatted prompt; longer inputs are compressed before the call.
+    # Budgets are practical request sizes, not context windows: llama-3.3-70b takes 128k tokens
+    # but Groq's per-minute token limits make larger requests fail, and gemini-2.0-flash takes
+    # 1M tokens but answers slowly and loses detail well before that (120k tokens is about
+    # 90k words, a ten-hour transcript or a long book).
     "groq_llama3_70b_fast": {
         "provider": "groq",
+        "input_token_budget": 24000,
         "config": {
             "model": "llama-3.3-70b-versatile",
             "temperature": 0.1,
@@ -8,6 +14,7 @@ MODEL_CONFIGS = {
     },
     "gemini_flash_2_strict": {
         "provider": "gemini",
+        "input_token_budget": 120000,
         "config": {
             "model": "gemini-2.0-flash",
             "temperature": 0.1,
@@ -1,14 +1,73 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from .routers import auth, quiz, summary
+from .routers import auth, quiz, summary, jobs
+from .db.mongodb import connect_to_mongo, close_mongo_connection
+from .db.indexes import ensure_indexes
+from .services.jobs import start_job_workers, stop_job_workers, get_job_worker_stats
+from .services.http_client import start_http_client, close_http_client
+from .services.llm_factory import close_llm_clients, get_llm_client_stats
+from .services.task_registry import build_task_registry, warm_up_task_registry
+from .services.response_cache import get_response_cache_stats
+from .services.single_flight import get_single_flight_stats
+from .services.quiz_cache import get_quiz_cache_stats
+from .utils.auth import get_principal_cache_stats
+from .utils.responses import FastJSONResponse
+from .utils.compression import CompressionMiddleware
+from .config import config
+from .services.password_hashing import shutdown_password_executor, get_password_hashing_stats
+from .services.transcript_cache import get_transcript_cache_stats
+from .services.audio_pipeline import shutdown_audio_executor, get_audio_pipeline_stats
+from .services.gemini_files import get_gemini_file_stats
+
+
+async def _warm_up_llm_stack():
+    try:
+        await asyncio.to_thread(warm_up_task_registry)
+    except Exception as e:
+        print(f"Warning: LLM warm-up failed, SDKs will load on first use: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Validates task configs only; the LLM SDKs are imported by the warm-up below
+    build_task_registry()
+    await start_http_client()
+    try:
+        await connect_to_mongo()
+    except Exception as e:
+        print(f"Warning: could not pre-warm MongoDB connections: {e}")
+    try:
+        await ensure_indexes()
+    except Exception as e:
+        print(f"Warning: could not ensure indexes: {e}")
+    start_job_workers()
+    warm_up_task = None
+    if config.LLM_WARMUP_ON_STARTUP:
+        warm_up_task = asyncio.create_task(_warm_up_llm_stack())
+    yield
+    if warm_up_task is not None and not warm_up_task.done():
+        warm_up_task.cancel()
+    await stop_job_workers()
+    await close_http_client()
+    await close_llm_clients()
+    shutdown_password_executor()
+    shutdown_audio_executor()
+    close_mongo_connection()
+
 
 app = FastAPI(
     title="LearnScribe Backend",
     description="FastAPI backend for the Learnsribe project.",
     version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
+app.add_middleware(CompressionMiddleware, minimum_size=config.RESPONSE_COMPRESSION_MIN_SIZE)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -26,6 +85,22 @@ def health_check():
     return JSONResponse({"status": "OK", "message": "LearnScribe backend is running."})
 
 
+@app.get("/stats", tags=["Health Check"])
+def cache_stats():
+    return JSONResponse({
+        "transcript_cache": get_transcript_cache_stats(),
+        "source_fetch_single_flight": get_single_flight_stats(),
+        "llm_clients": get_llm_client_stats(),
+        "llm_response_cache": get_response_cache_stats(),
+        "quiz_cache": get_quiz_cache_stats(),
+        "jobs": get_job_worker_stats(),
+        "password_hashing": get_password_hashing_stats(),
+        "principal_cache": get_principal_cache_stats(),
+        "audio_pipeline": get_audio_pipeline_stats(),
+        "gemini_files": get_gemini_file_stats(),
+    })
+
+
 # Authentication routes
 app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 
@@ -34,3 +109,6 @@ app.include_router(quiz.router, prefix="/quiz", tags=["Quizzes"])
 
 # Summary routes
 app.include_router(summary.router, prefix="/summary", tags=["Summaries"])
+
+# Background job routes
+app.include_router(jobs.router, prefix="/jobs", tags=["Jobs"])
@@ -3,9 +3,10 @@ from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from pydantic import BaseModel
 from datetime import datetime, timedelta, timezone
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 from app.db.mongodb import get_database
 from app.config import config
+from app.services.password_hashing import verify_password, get_password_hash, password_needs_update
+from app.utils.auth import invalidate_principal
 from bson import ObjectId
 
 
@@ -34,44 +35,38 @@ class UserIn(BaseModel):
     password: str
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
-
-
-def get_password_hash(password):
-    return pwd_context.hash(password)
-
-
 async def get_user_by_email(db, email: str):
     return await db.users.find_one({"email": email})
 
 
 async def authenticate_user(db, email: str, password: str):
     user = await get_user_by_email(db, email)
-    if not user or not verify_password(password, user["hashed_password"]):
+    if not user or not await verify_password(password, user["hashed_password"]):
         return False
 
     # If the hash is outdated, rehash and update the database
-    if pwd_context.needs_update(user["hashed_password"]):
-        new_hashed_password = get_password_hash(password)
+    if password_needs_update(user["hashed_password"]):
+        new_hashed_password = await get_password_hash(password)
         await db.users.update_one(
             {"email": email},
             {"$set": {"hashed_password": new_hashed_password}}
         )
+        invalidate_principal(user["user_id"])
 
     return user
 
 
-def create_token(email: str, user_id: str, expires_delta: timedelta):
+def create_token(email: str, user_id: str, expires_delta: timedelta, username: str = None):
     expire = datetime.now(timezone.utc) + expires_delta
-    return jwt.encode({
+    claims = {
         "email": email,
         "user_id": user_id,
         "expiry": expire.isoformat()
-    }, SECRET_KEY, algorithm=ALGORITHM)
+    }
+    # Lets read-only routes resolve the user from the token, see get_current_user_from_claims
+    if username is not None:
+        claims["username"] = username
+    return jwt.encode(claims, SECRET_KEY, algorithm=ALGORITHM)
 
 
 @router.post("/login")
@@ -86,8 +81,10 @@ async def login_for_access_token(response: Response, form_data: OAuth2PasswordRe
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    access_token = create_token(user["email"], user["user_id"], timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
-    refresh_token = create_token(user["email"], user["user_id"], timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS))
+    access_token = create_token(user["email"], user["user_id"], timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
+                                user.get("username"))
+    refresh_token = create_token(user["email"], user["user_id"], timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+                                 user.get("username"))
     response.set_cookie(
         key="refresh_token",
         value=refresh_token,
@@ -111,7 +108,8 @@ async def refresh_token(response: Response, request: Request):
             raise HTTPException(status_code=401, detail="Refresh token expired")
         email = payload.get("email")
         user_id = payload.get("user_id")
-        new_access_token = create_token(email, user_id, timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
+        new_access_token = create_token(email, user_id, timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
+                                        payload.get("username"))
         return {"access_token": new_access_token, "token_type": "bearer"}
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid refresh token")
@@ -130,7 +128,7 @@ async def register_user(user_in: UserIn):
         raise HTTPException(status_code=400, detail="Email already registered")
 
     try:
-        hashed_password = get_password_hash(user_in.password)
+        hashed_password = await get_password_hash(user_in.password)
         new_user = {
             "user_id": str(ObjectId()),
             "username": user_in.username,
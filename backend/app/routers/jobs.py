@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, HTTPException
+from app.utils.auth import get_current_user_from_claims, User
+from app.services.jobs import get_job
+
+router = APIRouter()
+
+
+@router.get("/{job_id}", status_code=200)
+async def get_job_status(job_id: str, current_user: User = Depends(get_current_user_from_claims)):
+    """
+    Report the status of a background job: queued, running, done or failed.
+    Finished jobs carry the resulting quiz_id or summary_id in `result`.
+    """
+    job = await get_job(job_id, current_user.user_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found.")
+
+    return {
+        "job_id": job["job_id"],
+        "type": job["type"],
+        "status": job["status"],
+        "result": job.get("result"),
+        "error": job.get("error"),
+        "attempts": job.get("attempts", 0),
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+    }
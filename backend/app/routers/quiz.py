@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, status
+from typing import Optional
 from datetime import datetime
 from bson import ObjectId
 from app.db.mongodb import get_database
-from app.utils.auth import get_current_user, User
+from app.config import config
+from app.utils.auth import get_current_user, get_current_user_from_claims, User
 from app.utils.quiz import generate_quiz
 from app.models.common_schemas import SourceTypes
 from app.models.quiz import (
@@ -11,84 +13,74 @@ from app.models.quiz import (
 )
 import random
 from app.utils.quiz_generator import generate_quiz_2
+from app.services.jobs import enqueue_job, register_job_handler
+from app.services.mistakes_transcript import record_mistakes
+from app.services.quiz_cache import get_cached_quiz, invalidate_quiz
+from app.utils.pagination import paginate, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.utils.responses import FastJSONResponse
 
 router = APIRouter()
 
+QUIZ_LIST_PROJECTION = {
+    "quiz_id": 1,
+    "quiz_title": 1,
+    "difficulty": 1,
+    "category": 1,
+    "quiz_source": 1,
+    "source_id": 1,
+    "created_by": 1,
+    "created_at": 1,
+    "attempt_count": 1,
+    "questions_count": 1,
+    "last_attempted_at": 1,
+    "best_score": 1,
+}
+
 
 @router.get("/myquizzes")
-async def get_all_quizzes(current_user: User = Depends(get_current_user)):
+async def get_all_quizzes(
+    current_user: User = Depends(get_current_user_from_claims),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fetch_all: bool = Query(False, alias="all"),
+):
     db = get_database()
     user_id = current_user.user_id
 
-    pipeline = [
-        {
-            '$match': {
-                'created_by': user_id
-            }
-        }, {
-            '$lookup': {
-                'from': 'quiz_attempts', 
-                'localField': 'quiz_id', 
-                'foreignField': 'quiz_id', 
-                'as': 'attempts'
-            }
-        }, {
-            '$set': {
-                'attempt_count': {
-                    '$size': '$attempts'
-                }, 
-                'questions_count': {
-                    '$size': '$questions'
-                }
-            }
-        }, {
-            '$project': {
-                '_id': 0,
-                'quiz_id': 1, 
-                'quiz_title': 1, 
-                'difficulty': 1, 
-                'category': 1, 
-                'quiz_source': 1, 
-                'source_id': 1, 
-                'created_by': 1, 
-                'created_at': 1, 
-                'attempt_count': 1, 
-                'questions_count': 1
-            }
-        }
-    ]
-
-    quizzes = await db.quizzes.aggregate(pipeline).to_list(length=None)
+    # attempt_count / questions_count are kept on the quiz document, so listing is one
+    # indexed read (quizzes_list_keyset) with no per-quiz lookup into quiz_attempts
+    quizzes, next_cursor = await paginate(
+        db.quizzes,
+        {"created_by": user_id},
+        QUIZ_LIST_PROJECTION,
+        sort_field="created_at",
+        limit=limit,
+        cursor=cursor,
+        fetch_all=fetch_all,
+    )
 
-    return {"quizzes": quizzes}
+    return {"quizzes": quizzes, "next_cursor": next_cursor}
 
 
 @router.get("/{quiz_id}", status_code=200)
-async def get_quiz_for_attempt(quiz_id: str, current_user: User = Depends(get_current_user)):
-    db = get_database()
-    pipeline = [
-        {"$match": {"quiz_id": quiz_id}},
-        {"$project": {
-            "_id": 0,
-            "questions.correct_choice_id": 0,
-            "questions.answer_explanation": 0,
-            "questions.choices.choice_explanation": 0,
-            "metadata": 0
-        }}
-    ]
-    result = await db.quizzes.aggregate(pipeline).to_list(length=1)
-    if not result:
+async def get_quiz_for_attempt(quiz_id: str, current_user: User = Depends(get_current_user_from_claims)):
+    entry = await get_cached_quiz(quiz_id)
+    if not entry:
         raise HTTPException(status_code=404, detail="Quiz not found.")
-    quiz = result[0]
+
+    # Copy out of the shared cache entry before shuffling
+    quiz = dict(entry["public_quiz"])
 
     # Randomize choices order for each question and then randomize question order
     if "questions" in quiz:
-        for question in quiz["questions"]:
-            if "choices" in question and isinstance(question["choices"], list):
-                random.shuffle(question["choices"])
+        quiz["questions"] = [
+            {**question, "choices": random.sample(question["choices"], len(question["choices"]))}
+            if isinstance(question.get("choices"), list) else dict(question)
+            for question in quiz["questions"]
+        ]
         random.shuffle(quiz["questions"])
 
-    return quiz
+    return FastJSONResponse(quiz)
 
 
 @router.delete("/{quiz_id}", status_code=200)
@@ -97,12 +89,16 @@ async def delete_quiz(quiz_id: str, current_user: User = Depends(get_current_use
     result = await db.quizzes.delete_one({"quiz_id": quiz_id, "created_by": current_user.user_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Quiz not found.")
+    invalidate_quiz(quiz_id)
+    # Practice quizzes never drew on questions from deleted quizzes
+    await db.user_mistakes.delete_many({"quiz_id": quiz_id})
     return {"message": "Quiz deleted successfully"}
 
 
-def process_quiz_responses(quiz, responses):
+def process_quiz_responses(quiz, responses, question_map=None):
     """Helper function to process quiz responses and generate results"""
-    question_map = {q["question_id"]: q for q in quiz.get("questions", [])}  # renamed key
+    if question_map is None:
+        question_map = {q["question_id"]: q for q in quiz.get("questions", [])}  # renamed key
     total_questions = len(quiz.get("questions", []))
     questions_result = []
     correct_count = 0
@@ -159,14 +155,14 @@ async def create_quiz_attempt(
 ):
     db = get_database()
 
-    quiz = await db.quizzes.find_one({"quiz_id": data.quiz_id})
-    if not quiz:
+    entry = await get_cached_quiz(data.quiz_id)
+    if not entry:
         raise HTTPException(status_code=404, detail="Quiz not found")
+    quiz = entry["quiz"]
+    question_map = entry["question_map"]
 
     responses = [r.dict() for r in data.responses]
-    processed = process_quiz_responses(quiz, responses)
-    # Build question map for lookup
-    question_map = {q["question_id"]: q for q in quiz.get("questions", [])}  # renamed key
+    processed = process_quiz_responses(quiz, responses, question_map)
 
     attempt_id = str(ObjectId())
     attempt_doc = {
@@ -190,8 +186,28 @@ async def create_quiz_attempt(
         "total_marks": processed["total_marks"],
         "attempted_at": datetime.utcnow()
     }
+    if config.ATTEMPT_RESULT_SNAPSHOTS:
+        # Graded breakdown, so GET /attempts/{id} never has to re-read the quiz
+        attempt_doc["questions_result"] = processed["questions_result"]
+
+    # Counters first: the cache (this worker's, or another's) can still hold a deleted
+    # quiz, and an attempt or mistakes written for it would be orphaned
+    result = await db.quizzes.update_one(
+        {"quiz_id": data.quiz_id},
+        {
+            "$inc": {"attempt_count": 1},
+            "$max": {
+                "last_attempted_at": attempt_doc["attempted_at"],
+                "best_score": attempt_doc["marks_obtained"],
+            },
+        }
+    )
+    if result.matched_count == 0:
+        invalidate_quiz(data.quiz_id)
+        raise HTTPException(status_code=404, detail="Quiz not found")
 
     await db.quiz_attempts.insert_one(attempt_doc)
+    await record_mistakes(current_user.user_id, quiz, responses, attempt_id, attempt_doc["attempted_at"])
     return {
         "quiz_id": data.quiz_id,
         "attempt_id": attempt_id,
@@ -202,23 +218,38 @@ async def create_quiz_attempt(
 @router.get("/attempts/{attempt_id}")
 async def get_quiz_attempt(
     attempt_id: str,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user_from_claims)
 ):
     db = get_database()
 
     attempt = await db.quiz_attempts.find_one(
-        {"attempt_id": attempt_id, "user_id": current_user.user_id}  # renamed key
+        {"attempt_id": attempt_id, "user_id": current_user.user_id},  # renamed key
+        {"_id": 0}
     )
     if not attempt:
         raise HTTPException(status_code=404, detail="Attempt not found")
 
-    quiz = await db.quizzes.find_one({"quiz_id": attempt["quiz_id"]})  # renamed key
-    if not quiz:
+    if "questions_result" in attempt:
+        return FastJSONResponse({
+            "attempt_id": attempt_id,
+            "quiz_id": attempt["quiz_id"],
+            "attempted_at": attempt["attempted_at"],
+            "stats": {
+                **attempt["stats"],
+                "marks_obtained": attempt["marks_obtained"],
+                "total_marks": attempt["total_marks"]
+            },
+            "questions": attempt["questions_result"]
+        })
+
+    # Attempts saved before result snapshots existed are graded on read
+    entry = await get_cached_quiz(attempt["quiz_id"])
+    if not entry:
         raise HTTPException(status_code=404, detail="Quiz not found")
 
-    processed = process_quiz_responses(quiz, attempt["responses"])
+    processed = process_quiz_responses(entry["quiz"], attempt["responses"], entry["question_map"])
 
-    return {
+    return FastJSONResponse({
         "attempt_id": attempt_id,
         "quiz_id": attempt["quiz_id"],
         "attempted_at": attempt["attempted_at"],
@@ -230,32 +261,41 @@ async def get_quiz_attempt(
             "total_marks": processed["total_marks"]
         },
         "questions": processed["questions_result"]
-    }
+    })
 
 
 @router.get("/{quiz_id}/attempts", status_code=200)
-async def get_quiz_attempts(quiz_id: str, current_user: User = Depends(get_current_user)):
+async def get_quiz_attempts(
+    quiz_id: str,
+    current_user: User = Depends(get_current_user_from_claims),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fetch_all: bool = Query(False, alias="all"),
+):
     db = get_database()
-    attempts = await db.quiz_attempts.find(
+    attempts, next_cursor = await paginate(
+        db.quiz_attempts,
         {"quiz_id": quiz_id, "user_id": current_user.user_id},  # renamed keys
         {
-            "_id": 0,
             "marks_obtained": 1,
             "total_marks": 1,
             "stats": 1,
             "attempted_at": 1,
             "attempt_id": 1
-        }
-    ).to_list(length=None)
+        },
+        sort_field="attempted_at",
+        limit=limit,
+        cursor=cursor,
+        fetch_all=fetch_all,
+    )
 
-    return {"attempts": attempts}
+    return {"attempts": attempts, "next_cursor": next_cursor}
 
 
 
-@router.post("/quiz2", status_code=status.HTTP_201_CREATED)
-async def create_quiz_2(quiz_data: QuizCreate, current_user: User = Depends(get_current_user)):
+async def create_and_save_quiz(quiz_data: QuizCreate, user_id: str) -> dict:
     try:
-        result = await generate_quiz_2(quiz_data, current_user.user_id)
+        result = await generate_quiz_2(quiz_data, user_id)
     except Exception as e:
         print(f"Error calling generate_quiz: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to initiate quiz generation: {e}")
@@ -283,9 +323,13 @@ async def create_quiz_2(quiz_data: QuizCreate, current_user: User = Depends(get_
         "category": ai_quiz.get("category", "General"), # Default category
         "quiz_source": result.get("quiz_source"),
         "source_id": result.get("source_id"),
-        "created_by": current_user.user_id,
+        "created_by": user_id,
         "created_at": datetime.utcnow(),
         "questions": ai_quiz.get("questions", []), # Questions should have IDs added
+        "questions_count": len(ai_quiz.get("questions", [])),
+        "attempt_count": 0,
+        "last_attempted_at": None,
+        "best_score": None,
         "metadata": {
             **(result.get("metadata", {})), # Include metadata like time_taken, task_used
             "llm_difficulty_generated": ai_quiz.get("difficulty"), # Store difficulty reported by LLM if any
@@ -306,3 +350,27 @@ async def create_quiz_2(quiz_data: QuizCreate, current_user: User = Depends(get_
         raise HTTPException(status_code=500, detail=f"Database error while saving quiz: {e}")
 
     return {"message": "Quiz created successfully", "quiz_id": quiz_doc["quiz_id"]}
+
+
+@router.post("/quiz2", status_code=status.HTTP_201_CREATED)
+async def create_quiz_2(quiz_data: QuizCreate, current_user: User = Depends(get_current_user)):
+    return await create_and_save_quiz(quiz_data, current_user.user_id)
+
+
+async def run_quiz_job(payload: dict, user_id: str) -> dict:
+    response = await create_and_save_quiz(QuizCreate(**payload), user_id)
+    return {"quiz_id": response["quiz_id"]}
+
+
+register_job_handler("quiz", run_quiz_job)
+
+
+@router.post("/quiz2/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def create_quiz_2_job(
+    quiz_data: QuizCreate,
+    current_user: User = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(default=None),
+):
+    """Queue quiz generation and return a job_id to poll at GET /jobs/{job_id}."""
+    job = await enqueue_job("quiz", quiz_data.model_dump(mode="json"), current_user.user_id, idempotency_key)
+    return {"job_id": job["job_id"], "status": job["status"]}
@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, root_validator
 from typing import Optional
 from datetime import datetime
 from bson import ObjectId
+import json
 from app.db.mongodb import get_database
-from app.utils.auth import get_current_user, User
-from app.utils.summary import generate_summary
+from app.utils.auth import get_current_user, get_current_user_from_claims, User
+from app.utils.summary import generate_summary, stream_summary
+from app.services.jobs import enqueue_job, register_job_handler
+from app.utils.pagination import paginate, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.utils.responses import FastJSONResponse
 from app.models.common_schemas import SourceTypes
 from enum import Enum
 
@@ -46,13 +51,7 @@ class SummaryCreate(BaseModel):
         return values
 
 
-@router.post("/", status_code=status.HTTP_201_CREATED)
-async def create_summary(summary_data: SummaryCreate,
-                        current_user: User = Depends(get_current_user)):
-    result = generate_summary(summary_data)
-    if "error" in result:
-        raise HTTPException(status_code=500, detail=result["error"])
-
+async def save_summary(result: dict, user_id: str) -> dict:
     if "related_questions" in result and isinstance(result["related_questions"], list):
         result["related_questions"] = [
             q.dict() if hasattr(q, "dict") else q.model_dump() if hasattr(q, "model_dump") else q 
@@ -62,9 +61,9 @@ async def create_summary(summary_data: SummaryCreate,
     # Prepare document for database
     summary_doc = {
         "summary_id": str(ObjectId()),
-        "user_id": current_user.user_id,
+        "user_id": user_id,
         **result,
-        "created_by": current_user.user_id,
+        "created_by": user_id,
         "created_at": datetime.utcnow(),
     }
 
@@ -72,6 +71,17 @@ async def create_summary(summary_data: SummaryCreate,
     insert_result = await db.summaries.insert_one(summary_doc)
     if not insert_result.inserted_id:
         raise HTTPException(status_code=500, detail="Unable to create summary.")
+    return summary_doc
+
+
+@router.post("/", status_code=status.HTTP_201_CREATED)
+async def create_summary(summary_data: SummaryCreate,
+                        current_user: User = Depends(get_current_user)):
+    result = await generate_summary(summary_data)
+    if "error" in result:
+        raise HTTPException(status_code=500, detail=result["error"])
+
+    summary_doc = await save_summary(result, current_user.user_id)
 
     return {
         "message": "Summary created successfully",
@@ -79,25 +89,97 @@ async def create_summary(summary_data: SummaryCreate,
     }
 
 
+async def run_summary_job(payload: dict, user_id: str) -> dict:
+    result = await generate_summary(SummaryCreate(**payload))
+    if "error" in result:
+        raise ValueError(result["error"])
+    summary_doc = await save_summary(result, user_id)
+    return {"summary_id": summary_doc["summary_id"]}
+
+
+register_job_handler("summary", run_summary_job)
+
+
+@router.post("/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def create_summary_job(summary_data: SummaryCreate,
+                             current_user: User = Depends(get_current_user),
+                             idempotency_key: Optional[str] = Header(default=None)):
+    """
+    Queue summary generation and return a job_id to poll at GET /jobs/{job_id}.
+    """
+    job = await enqueue_job("summary", summary_data.model_dump(mode="json"), current_user.user_id, idempotency_key)
+    return {"job_id": job["job_id"], "status": job["status"]}
+
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.post("/stream")
+async def create_summary_stream(summary_data: SummaryCreate,
+                                current_user: User = Depends(get_current_user)):
+    """
+    Stream a summary as Server-Sent Events. Emits `status` and `summary` events
+    with the partial markdown summary_text, then `done` once the summary is saved.
+    """
+    async def event_stream():
+        async for event, payload in stream_summary(summary_data):
+            if event == "status":
+                yield sse_event("status", {"stage": payload})
+            elif event == "partial":
+                yield sse_event("summary", {"summary_text": payload})
+            elif event == "error":
+                yield sse_event("error", {"detail": payload})
+            elif event == "done":
+                try:
+                    summary_doc = await save_summary(payload, current_user.user_id)
+                except Exception as e:
+                    yield sse_event("error", {"detail": f"Unable to create summary: {e}"})
+                    return
+                yield sse_event("done", {
+                    "message": "Summary created successfully",
+                    "summary_id": summary_doc["summary_id"],
+                    "title": summary_doc.get("title"),
+                    "summary_text": summary_doc.get("summary_text"),
+                })
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/mysummaries", status_code=200)
-async def get_all_summaries(current_user: User = Depends(get_current_user)):
+async def get_all_summaries(current_user: User = Depends(get_current_user_from_claims),
+                            limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                            cursor: Optional[str] = None,
+                            fetch_all: bool = Query(False, alias="all")):
+    """
+    List the user's summaries, newest first. Pass `next_cursor` back as `cursor`
+    for the next page, or `all=true` for the whole list.
+    """
     db = get_database()
-    summaries = await db.summaries.find(
-        {"created_by": current_user.user_id}, 
+    summaries, next_cursor = await paginate(
+        db.summaries,
+        {"created_by": current_user.user_id},
         {
-            "_id": 0,
             "summary_id": 1,
             "source_type": 1,
             "title": 1,
             "created_at": 1
-        }
-    ).to_list(length=None)
+        },
+        sort_field="created_at",
+        limit=limit,
+        cursor=cursor,
+        fetch_all=fetch_all,
+    )
 
-    return {"summaries": summaries}
+    return {"summaries": summaries, "next_cursor": next_cursor}
 
 
 @router.get("/{summary_id}", status_code=200)
-async def get_summary(summary_id: str, current_user: User = Depends(get_current_user)):
+async def get_summary(summary_id: str, current_user: User = Depends(get_current_user_from_claims)):
     """
     Retrieve a specific summary by ID.
     """
@@ -110,7 +192,7 @@ async def get_summary(summary_id: str, current_user: User = Depends(get_current_
     if not summary:
         raise HTTPException(status_code=404, detail="Summary not found.")
 
-    return summary
+    return FastJSONResponse(summary)
 
 
 @router.delete("/{summary_id}", status_code=200)
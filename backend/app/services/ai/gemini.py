@@ -1,5 +1,3 @@
-from google import genai
-from google.genai import types
 from app.config import config
 import os
 from typing import Optional, Type
@@ -7,17 +5,25 @@ from pydantic import BaseModel
 import json
 
 GOOGLE_GEMINI_KEY = config.GOOGLE_GEMINI_KEY
+_client = None
 
 
 def get_gemini_client():
-    return genai.Client(
-        api_key=GOOGLE_GEMINI_KEY,
-    )
-
-
-def audio_to_json_gemini(audio_file, prompt, model, question_count):
-    client = get_gemini_client()
-
+    """Shared client, created on first use. The SDK is imported here to keep it out of app startup."""
+    global _client
+    if _client is None:
+        from google import genai
+        _client = genai.Client(
+            api_key=GOOGLE_GEMINI_KEY,
+        )
+    return _client
+
+
+def upload_audio_file(audio_file):
+    """
+    Uploads an audio file to the Gemini Files API. Returns {"name", "uri", "mime_type",
+    "size_bytes", "expires_at"}, or None if the file is missing or empty.
+    """
     # Validate that the audio file exists and is readable
     if not os.path.exists(audio_file):
         print(f"Error: Audio file not found at path: {audio_file}")
@@ -28,24 +34,48 @@ def audio_to_json_gemini(audio_file, prompt, model, question_count):
         print(f"Error: Audio file is empty: {audio_file}")
         return None
 
-    print(f"Processing audio file: {audio_file} (Size: {file_size} bytes)")
+    print(f"Uploading audio file: {audio_file} (Size: {file_size} bytes)")
+    uploaded = get_gemini_client().files.upload(file=audio_file)
+    return {
+        "name": uploaded.name,
+        "uri": uploaded.uri,
+        "mime_type": uploaded.mime_type,
+        "size_bytes": file_size,
+        "expires_at": uploaded.expiration_time,
+    }
 
-    files = [
-        client.files.upload(file=audio_file),
-    ]
 
-    # use question_count in the chat prompt
-    parts_prompt = f"create a quiz, {question_count} questions" 
+def is_missing_file_error(error) -> bool:
+    """
+    True when Gemini rejected a request because an uploaded file no longer exists. Deleted
+    or expired files come back as 403 "...access the File <name> or it may not exist", so a
+    403 only counts with that wording; other 403s (bad key, quota) and 404s for anything
+    other than a file (e.g. an unknown model) are real errors.
+    """
+    code = getattr(error, "code", None)
+    message = str(getattr(error, "message", None) or error).lower()
+    if "file" not in message:
+        return False
+    if code == 404:
+        return True
+    return code == 403 and "may not exist" in message
+
+
+def audio_to_json_gemini(audio_refs, prompt, model, response_schema: Optional[Type[BaseModel]] = None):
+    """Runs prompt against uploaded audio files, given in order as {"uri", "mime_type"}, and returns JSON text."""
+    from google.genai import types
+    client = get_gemini_client()
+
     contents = [
         types.Content(
             role="user",
             parts=[
-                types.Part.from_uri(
-                    file_uri=files[0].uri,
-                    mime_type=files[0].mime_type,
+                *(
+                    types.Part.from_uri(file_uri=audio_ref["uri"], mime_type=audio_ref["mime_type"])
+                    for audio_ref in audio_refs
                 ),
                 types.Part.from_text(
-                    text=parts_prompt
+                    text=prompt
                 ),
             ],
         ),
@@ -57,6 +87,7 @@ def audio_to_json_gemini(audio_file, prompt, model, question_count):
         top_k=40,
         max_output_tokens=8192,
         response_mime_type="application/json",
+        response_schema=response_schema,
     )
     response = client.models.generate_content(
         model=model,
@@ -73,7 +104,7 @@ def audio_to_json_gemini(audio_file, prompt, model, question_count):
 
 
 def generate_quiz_from_text(prompt: str, model_id: str, response_schema: Optional[Type[BaseModel]] = None):
-    client = genai.Client(api_key=GOOGLE_GEMINI_KEY)
+    client = get_gemini_client()
     config = {
         'response_mime_type': 'application/json',
     }
@@ -1,8 +1,9 @@
-from groq import Groq
 from app.config import config
 
 
 def groq_client():
+    # Imported on first use to keep the SDK out of app startup
+    from groq import Groq
     return Groq(
         api_key=config.GROQ_API_KEY,
     )
@@ -1,8 +1,9 @@
-import requests
+import httpx
 from app.config import config
+from app.services.http_client import fetch
 
 
-def webpage_extractor_rapid_api(article_url):
+async def webpage_extractor_rapid_api(article_url):
     url = "https://webpage-extractor1.p.rapidapi.com/webpage_extractor/text"
     payload = {"url": article_url}
     headers = {
@@ -11,10 +12,14 @@ def webpage_extractor_rapid_api(article_url):
         "Content-Type": "application/json",
         "x-token": "Makshad Nai Bhoolna @ 2025"
     }
-    response = requests.post(url, json=payload, headers=headers)
-    return response.json()
+    try:
+        response = await fetch("POST", url, json=payload, headers=headers)
+        return response.json()
+    except (httpx.HTTPError, ValueError) as e:
+        print(f"Error extracting article {article_url}: {e}")
+        return {}
 
 
-def get_article_transcript(article_url):
-    transcript = webpage_extractor_rapid_api(article_url)
+async def get_article_transcript(article_url):
+    transcript = await webpage_extractor_rapid_api(article_url)
     return transcript.get('response', '')
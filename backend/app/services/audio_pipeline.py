@@ -0,0 +1,90 @@
+import asyncio
+import math
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Optional
+from app.config import config
+from app.services.youtube import download_youtube_audio, get_audio_duration, cut_audio_segment
+
+_executor: Optional[ProcessPoolExecutor] = None
+_stats = {"running": 0, "completed": 0, "failed": 0}
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # spawn, not fork: the parent holds event loop, Mongo and executor threads
+        _executor = ProcessPoolExecutor(
+            max_workers=config.AUDIO_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def segment_windows(duration: float, segment_seconds: int) -> list:
+    """(start, length) pairs splitting duration into equal windows of at most segment_seconds."""
+    count = max(1, math.ceil(duration / segment_seconds))
+    length = duration / count
+    # The last window runs a second long so rounding never drops the tail
+    return [(round(i * length, 3), round(length, 3) + (1 if i == count - 1 else 0)) for i in range(count)]
+
+
+def extract_youtube_audio(url: str, output_dir: str, segment_seconds: int, threshold_seconds: int):
+    """
+    Reads the video's duration once, encodes its audio, and for videos longer than
+    threshold_seconds cuts it into segment_windows, each allowed AUDIO_MAX_SIZE_BYTES.
+    Returns the files in order (one file for shorter videos), or None on failure.
+    Blocking; runs in the audio pool.
+    """
+    duration = get_audio_duration(url)
+    windows = segment_windows(duration, segment_seconds) if duration and duration > threshold_seconds else []
+    audio_file = download_youtube_audio(url, output_dir, config.AUDIO_MAX_SIZE_BYTES * max(1, len(windows)), duration)
+    if not audio_file or not windows:
+        return [audio_file] if audio_file else None
+
+    base, ext = os.path.splitext(audio_file)
+    segment_files = [
+        cut_audio_segment(audio_file, f"{base}-{i + 1:03d}{ext}", start, length)
+        for i, (start, length) in enumerate(windows)
+    ]
+    return segment_files if all(segment_files) else None
+
+
+@asynccontextmanager
+async def youtube_audio(url: str, segment_seconds: int, threshold_seconds: int):
+    """
+    Runs extract_youtube_audio in the audio process pool, yielding its list of files
+    (or None on failure). Every call gets its own temp directory, which is removed on
+    exit, so concurrent requests for the same video never share files.
+    """
+    temp_dir = tempfile.mkdtemp(prefix="learnscribe-audio-")
+    _stats["running"] += 1
+    try:
+        loop = asyncio.get_running_loop()
+        try:
+            audio_files = await loop.run_in_executor(
+                _get_executor(), extract_youtube_audio, url, temp_dir, segment_seconds, threshold_seconds
+            )
+        except Exception:
+            _stats["failed"] += 1
+            raise
+        _stats["completed" if audio_files else "failed"] += 1
+        yield audio_files
+    finally:
+        _stats["running"] -= 1
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def shutdown_audio_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def get_audio_pipeline_stats() -> dict:
+    return {**_stats, "workers": config.AUDIO_WORKERS}
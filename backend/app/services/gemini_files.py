@@ -0,0 +1,176 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from app.config import config
+from app.db.mongodb import get_database
+from app.services.youtube import get_video_id
+from app.services.audio_pipeline import youtube_audio
+from app.services.single_flight import single_flight
+from app.services.ai.gemini import upload_audio_file
+
+GEMINI_FILES_COLLECTION = "gemini_files"
+GEMINI_FILE_SEGMENTS_COLLECTION = "gemini_file_segments"
+
+# Files uploaded to the Gemini Files API are deleted after 48 hours
+GEMINI_FILE_LIFETIME = timedelta(hours=48)
+
+_stats = {"reused": 0, "uploaded": 0, "upload_bytes": 0, "invalidated": 0}
+
+
+def _to_naive_utc(value) -> datetime:
+    # Stored dates are naive UTC, matching the rest of the collections
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+async def get_registered_file(video_id: str):
+    """The uploaded audio for a video, if it stays valid for at least GEMINI_FILE_REUSE_MARGIN_SECONDS."""
+    valid_until = datetime.utcnow() + timedelta(seconds=config.GEMINI_FILE_REUSE_MARGIN_SECONDS)
+    try:
+        return await get_database()[GEMINI_FILES_COLLECTION].find_one(
+            {"video_id": video_id, "expires_at": {"$gt": valid_until}},
+            {"_id": 0, "uri": 1, "mime_type": 1, "expires_at": 1}
+        )
+    except Exception as e:
+        print(f"Warning: Gemini file registry read failed for {video_id}: {e}")
+        return None
+
+
+def _registry_fields(file_ref: dict) -> dict:
+    expires_at = file_ref.get("expires_at")
+    return {
+        "name": file_ref.get("name"),
+        "uri": file_ref["uri"],
+        "mime_type": file_ref["mime_type"],
+        "size_bytes": file_ref.get("size_bytes"),
+        "uploaded_at": datetime.utcnow(),
+        "expires_at": _to_naive_utc(expires_at) if expires_at else datetime.utcnow() + GEMINI_FILE_LIFETIME,
+    }
+
+
+async def register_file(video_id: str, file_ref: dict):
+    try:
+        await get_database()[GEMINI_FILES_COLLECTION].update_one(
+            {"video_id": video_id},
+            {"$set": _registry_fields(file_ref)},
+            upsert=True
+        )
+    except Exception as e:
+        print(f"Warning: Gemini file registry write failed for {video_id}: {e}")
+
+
+async def get_registered_segments(video_id: str, segment_seconds: int):
+    """The uploaded segments of a video in order, only if every one of them is still valid."""
+    valid_until = datetime.utcnow() + timedelta(seconds=config.GEMINI_FILE_REUSE_MARGIN_SECONDS)
+    try:
+        segments = await get_database()[GEMINI_FILE_SEGMENTS_COLLECTION].find(
+            {"video_id": video_id, "segment_seconds": segment_seconds, "expires_at": {"$gt": valid_until}},
+            {"_id": 0, "segment_index": 1, "segment_count": 1, "uri": 1, "mime_type": 1}
+        ).sort("segment_index", 1).to_list(length=None)
+    except Exception as e:
+        print(f"Warning: Gemini segment registry read failed for {video_id}: {e}")
+        return None
+    if not segments or [s["segment_index"] for s in segments] != list(range(segments[0]["segment_count"])):
+        return None
+    return segments
+
+
+async def register_segment(video_id: str, segment_seconds: int, segment_index: int, segment_count: int,
+                           file_ref: dict):
+    try:
+        await get_database()[GEMINI_FILE_SEGMENTS_COLLECTION].update_one(
+            {"video_id": video_id, "segment_seconds": segment_seconds, "segment_index": segment_index},
+            {"$set": {**_registry_fields(file_ref), "segment_count": segment_count}},
+            upsert=True
+        )
+    except Exception as e:
+        print(f"Warning: Gemini segment registry write failed for {video_id}: {e}")
+
+
+async def remove_stale_segments(video_id: str, segment_seconds: int, segment_count: int):
+    """Drops segments past segment_count, left over from an upload that cut the video differently."""
+    try:
+        await get_database()[GEMINI_FILE_SEGMENTS_COLLECTION].delete_many(
+            {"video_id": video_id, "segment_seconds": segment_seconds, "segment_index": {"$gte": segment_count}}
+        )
+    except Exception as e:
+        print(f"Warning: Gemini segment registry cleanup failed for {video_id}: {e}")
+
+
+async def invalidate_file(video_id: str):
+    """Forgets a video's uploaded files, e.g. after Gemini reports one no longer exists."""
+    _stats["invalidated"] += 1
+    db = get_database()
+    try:
+        await db[GEMINI_FILES_COLLECTION].delete_one({"video_id": video_id})
+        await db[GEMINI_FILE_SEGMENTS_COLLECTION].delete_many({"video_id": video_id})
+    except Exception as e:
+        print(f"Warning: Gemini file registry delete failed for {video_id}: {e}")
+
+
+def _audio_ref(doc: dict) -> dict:
+    return {"uri": doc["uri"], "mime_type": doc["mime_type"]}
+
+
+async def _upload_video_audio(source_url: str, video_id: str, segment_seconds: int):
+    """
+    Extracts and uploads the video's audio: one file, or AUDIO_SEGMENT_SECONDS windows
+    uploaded concurrently for videos longer than AUDIO_SEGMENT_THRESHOLD_SECONDS.
+    """
+    async with youtube_audio(source_url, segment_seconds, config.AUDIO_SEGMENT_THRESHOLD_SECONDS) as audio_files:
+        if not audio_files:
+            return None
+        semaphore = asyncio.Semaphore(config.AUDIO_SEGMENT_CONCURRENCY)
+
+        async def upload(audio_file):
+            async with semaphore:
+                return await asyncio.to_thread(upload_audio_file, audio_file)
+
+        file_refs = await asyncio.gather(*(upload(audio_file) for audio_file in audio_files))
+    if not all(file_refs):
+        return None
+
+    _stats["uploaded"] += len(file_refs)
+    _stats["upload_bytes"] += sum(file_ref.get("size_bytes") or 0 for file_ref in file_refs)
+    if len(file_refs) == 1:
+        await register_file(video_id, file_refs[0])
+    else:
+        await asyncio.gather(*(
+            register_segment(video_id, segment_seconds, index, len(file_refs), file_ref)
+            for index, file_ref in enumerate(file_refs)
+        ))
+        await remove_stale_segments(video_id, segment_seconds, len(file_refs))
+    return [_audio_ref(file_ref) for file_ref in file_refs]
+
+
+async def get_gemini_audio_refs(source_url: str):
+    """
+    Returns the video's audio on the Gemini Files API as a list of {"uri", "mime_type"}:
+    a single file, or consecutive AUDIO_SEGMENT_SECONDS windows for videos longer than
+    AUDIO_SEGMENT_THRESHOLD_SECONDS. Registered uploads are reused while valid and
+    concurrent requests for the same video share one extraction and upload. None on failure.
+    """
+    video_id = get_video_id(source_url)
+    if not video_id:
+        return None
+
+    registered = await get_registered_file(video_id)
+    if registered:
+        _stats["reused"] += 1
+        return [_audio_ref(registered)]
+
+    segment_seconds = config.AUDIO_SEGMENT_SECONDS
+    segments = await get_registered_segments(video_id, segment_seconds)
+    if segments:
+        _stats["reused"] += len(segments)
+        return [_audio_ref(segment) for segment in segments]
+
+    # The duration probe that decides on segmenting runs inside the shared extraction
+    return await single_flight(
+        f"gemini_audio:{video_id}:{segment_seconds}",
+        lambda: _upload_video_audio(source_url, video_id, segment_seconds)
+    )
+
+
+def get_gemini_file_stats() -> dict:
+    return dict(_stats)
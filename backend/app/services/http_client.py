@@ -0,0 +1,62 @@
+import asyncio
+from typing import Optional
+from urllib.parse import urlsplit
+import httpx
+from app.config import config
+
+_client: Optional[httpx.AsyncClient] = None
+_host_semaphores = {}
+
+
+def _build_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(
+            config.HTTP_TIMEOUT_SECONDS,
+            connect=config.HTTP_CONNECT_TIMEOUT_SECONDS,
+        ),
+        limits=httpx.Limits(
+            max_connections=config.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+    )
+
+
+async def start_http_client():
+    """Creates the shared client. Called from the app lifespan."""
+    global _client
+    if _client is None:
+        _client = _build_client()
+
+
+async def close_http_client():
+    """Closes the shared client and its pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Returns the shared client, creating it lazily outside of the app lifespan."""
+    global _client
+    if _client is None:
+        _client = _build_client()
+    return _client
+
+
+def _host_semaphore(url: str) -> asyncio.Semaphore:
+    host = urlsplit(url).netloc
+    semaphore = _host_semaphores.get(host)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(config.HTTP_MAX_CONNECTIONS_PER_HOST)
+        _host_semaphores[host] = semaphore
+    return semaphore
+
+
+async def fetch(method: str, url: str, **kwargs) -> httpx.Response:
+    """
+    Sends a request through the shared client, capping concurrent requests per host.
+    Raises httpx.HTTPError on transport failures and timeouts.
+    """
+    async with _host_semaphore(url):
+        return await get_http_client().request(method, url, **kwargs)
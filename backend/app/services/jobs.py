@@ -0,0 +1,180 @@
+import asyncio
+import os
+import socket
+from datetime import datetime, timedelta
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from app.config import config
+from app.db.mongodb import get_database
+
+
+class JobStatus:
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+# job type -> async handler(payload, user_id) returning a result dict
+_handlers = {}
+_workers = []
+_wakeup = asyncio.Event()
+
+
+def register_job_handler(job_type: str, handler):
+    _handlers[job_type] = handler
+
+
+async def enqueue_job(job_type: str, payload: dict, user_id: str, idempotency_key: str = None) -> dict:
+    """
+    Stores a queued job and wakes the workers. A repeated idempotency key for the
+    same user returns the existing job instead of queueing the work again.
+    """
+    if job_type not in _handlers:
+        raise ValueError(f"Unknown job type: {job_type}")
+
+    db = get_database()
+    if idempotency_key:
+        existing = await db.jobs.find_one({"user_id": user_id, "idempotency_key": idempotency_key}, {"_id": 0})
+        if existing:
+            return existing
+
+    now = datetime.utcnow()
+    job = {
+        "job_id": str(ObjectId()),
+        "type": job_type,
+        "user_id": user_id,
+        "payload": payload,
+        "status": JobStatus.QUEUED,
+        "attempts": 0,
+        "result": None,
+        "error": None,
+        "created_at": now,
+        "updated_at": now,
+    }
+    if idempotency_key:
+        job["idempotency_key"] = idempotency_key
+
+    try:
+        await db.jobs.insert_one(job)
+    except DuplicateKeyError:
+        # Lost a race with a concurrent retry carrying the same key
+        return await db.jobs.find_one({"user_id": user_id, "idempotency_key": idempotency_key}, {"_id": 0})
+
+    job.pop("_id", None)
+    _wakeup.set()
+    return job
+
+
+async def get_job(job_id: str, user_id: str):
+    db = get_database()
+    return await db.jobs.find_one({"job_id": job_id, "user_id": user_id}, {"_id": 0, "payload": 0})
+
+
+async def _claim_job(worker_id: str):
+    """Atomically takes the oldest queued job, or a running job whose lease has expired."""
+    db = get_database()
+    now = datetime.utcnow()
+    return await db.jobs.find_one_and_update(
+        {
+            "type": {"$in": list(_handlers)},
+            "$or": [
+                {"status": JobStatus.QUEUED},
+                {"status": JobStatus.RUNNING, "lease_expires_at": {"$lt": now}},
+            ],
+        },
+        {
+            "$set": {
+                "status": JobStatus.RUNNING,
+                "worker_id": worker_id,
+                "lease_expires_at": now + timedelta(seconds=config.JOB_LEASE_SECONDS),
+                "updated_at": now,
+            },
+            "$inc": {"attempts": 1},
+        },
+        sort=[("created_at", 1)],
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+async def _finish_job(job: dict, worker_id: str, status: str, result=None, error=None):
+    db = get_database()
+    # Only the worker still holding the lease may record the outcome
+    await db.jobs.update_one(
+        {"job_id": job["job_id"], "worker_id": worker_id},
+        {
+            "$set": {"status": status, "result": result, "error": error, "updated_at": datetime.utcnow()},
+            "$unset": {"lease_expires_at": ""},
+        },
+    )
+
+
+async def _renew_lease(job: dict, worker_id: str):
+    db = get_database()
+    while True:
+        await asyncio.sleep(config.JOB_LEASE_SECONDS / 3)
+        now = datetime.utcnow()
+        await db.jobs.update_one(
+            {"job_id": job["job_id"], "worker_id": worker_id, "status": JobStatus.RUNNING},
+            {"$set": {"lease_expires_at": now + timedelta(seconds=config.JOB_LEASE_SECONDS), "updated_at": now}},
+        )
+
+
+async def _run_job(job: dict, worker_id: str):
+    if job["attempts"] > config.JOB_MAX_ATTEMPTS:
+        await _finish_job(job, worker_id, JobStatus.FAILED, error="Job exceeded the maximum number of attempts.")
+        return
+
+    handler = _handlers[job["type"]]
+    heartbeat = asyncio.create_task(_renew_lease(job, worker_id))
+    try:
+        result = await handler(job["payload"], job["user_id"])
+    except Exception as e:
+        print(f"Job {job['job_id']} ({job['type']}) failed: {e}")
+        await _finish_job(job, worker_id, JobStatus.FAILED, error=str(e))
+    else:
+        await _finish_job(job, worker_id, JobStatus.DONE, result=result)
+    finally:
+        heartbeat.cancel()
+
+
+async def _worker_loop(worker_id: str):
+    while True:
+        try:
+            job = await _claim_job(worker_id)
+        except Exception as e:
+            print(f"Job worker {worker_id} could not claim a job: {e}")
+            job = None
+
+        if job is None:
+            try:
+                await asyncio.wait_for(_wakeup.wait(), timeout=config.JOB_POLL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            _wakeup.clear()
+            continue
+
+        try:
+            await _run_job(job, worker_id)
+        except Exception as e:
+            print(f"Job worker {worker_id} failed to record job {job.get('job_id')}: {e}")
+
+
+def start_job_workers():
+    """Starts JOB_WORKERS worker tasks. Called from the app lifespan."""
+    prefix = f"{socket.gethostname()}-{os.getpid()}"
+    for i in range(config.JOB_WORKERS):
+        _workers.append(asyncio.create_task(_worker_loop(f"{prefix}-{i}")))
+
+
+async def stop_job_workers():
+    """Cancels the workers. Jobs they were running are retried once their lease expires."""
+    for worker in _workers:
+        worker.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+
+
+def get_job_worker_stats() -> dict:
+    return {"workers": len(_workers), "handlers": list(_handlers)}
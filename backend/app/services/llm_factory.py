@@ -1,31 +1,124 @@
-from langchain_groq import ChatGroq
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_openai import ChatOpenAI as OpenRouterChatOpenAI
+import copy
+import threading
+import httpx
 from typing import Dict, Any
 from app.config import config
+from app.llm_config import MODEL_CONFIGS
 
+# Provider SDKs take seconds to import, so each is loaded the first time its
+# provider is used (or by the startup warm-up), never at module import.
 
-def get_llm_client(model_config: Dict[str, Any]):
+# model_config_name -> {"client", "http_clients", "requests"}
+_client_registry = {}
+# The startup warm-up builds clients from a worker thread
+_registry_lock = threading.Lock()
+
+
+def _build_http_clients():
+    limits = httpx.Limits(
+        max_connections=config.LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=config.LLM_MAX_KEEPALIVE_CONNECTIONS,
+    )
+    return httpx.Client(limits=limits), httpx.AsyncClient(limits=limits)
+
+
+def get_llm_client(model_config: Dict[str, Any], http_client=None, http_async_client=None):
+    """Builds a new chat client for a model config. The config dict is never modified."""
     provider = model_config.get("provider")
-    config_params = model_config.get("config", {})
+    config_params = copy.deepcopy(model_config.get("config", {}))
     print(f"LLM provider: {provider}")
-    print(f"LLM config params: {config_params}")
+    print(f"LLM model: {config_params.get('model')}")
+
+    http_params = {}
+    if http_client is not None:
+        http_params["http_client"] = http_client
+    if http_async_client is not None:
+        http_params["http_async_client"] = http_async_client
 
     if provider == "groq":
+        from langchain_groq import ChatGroq
         config_params["groq_api_key"] = config.GROQ_API_KEY
-        return ChatGroq(**config_params)
+        return ChatGroq(**config_params, **http_params)
 
     elif provider == "gemini":
+        from langchain_google_genai import ChatGoogleGenerativeAI
         config_params["google_api_key"] = config.GOOGLE_GEMINI_KEY
         return ChatGoogleGenerativeAI(**config_params)
 
     elif provider == "openrouter":
+        from langchain_openai import ChatOpenAI as OpenRouterChatOpenAI
         config_params["openai_api_key"] = config.OPEN_ROUTER_KEY
         config_params.setdefault("model_kwargs", {}).setdefault("headers", {
             "HTTP-Referer": config_params.get("your_site_url"),
             "X-Title": config_params.get("your_site_name"),
         })
-        return OpenRouterChatOpenAI(**config_params)
+        return OpenRouterChatOpenAI(**config_params, **http_params)
 
     else:
         raise ValueError(f"Unsupported LLM provider: {provider}")
+
+
+def _get_registry_entry(model_config_name: str) -> dict:
+    entry = _client_registry.get(model_config_name)
+    if entry is not None:
+        return entry
+
+    with _registry_lock:
+        entry = _client_registry.get(model_config_name)
+        if entry is not None:
+            return entry
+
+        model_config = MODEL_CONFIGS.get(model_config_name)
+        if not model_config:
+            raise ValueError(f"Model configuration '{model_config_name}' not found.")
+
+        http_clients = ()
+        if model_config.get("provider") in ("groq", "openrouter"):
+            http_clients = _build_http_clients()
+        client = get_llm_client(model_config, *http_clients)
+        entry = {"client": client, "http_clients": http_clients, "requests": 0}
+        _client_registry[model_config_name] = entry
+        return entry
+
+
+def get_registered_llm_client(model_config_name: str):
+    """
+    Returns the shared client for a model config name, building it on first use.
+    Groq and OpenRouter clients get their own pooled httpx clients; Gemini uses gRPC.
+    """
+    entry = _get_registry_entry(model_config_name)
+    entry["requests"] += 1
+    return entry["client"]
+
+
+def warm_up_llm_client(model_config_name: str):
+    """Builds the shared client (importing its provider SDK) without counting a request."""
+    _get_registry_entry(model_config_name)
+
+
+def _idle_connections(http_client) -> int:
+    # httpx does not expose pool state publicly, so read it off the httpcore pool
+    pool = getattr(getattr(http_client, "_transport", None), "_pool", None)
+    connections = getattr(pool, "connections", None) or []
+    return sum(1 for conn in connections if conn.is_idle())
+
+
+def get_llm_client_stats() -> dict:
+    stats = {}
+    for name, entry in _client_registry.items():
+        idle = None
+        if entry["http_clients"]:
+            idle = sum(_idle_connections(c) for c in entry["http_clients"])
+        stats[name] = {"requests": entry["requests"], "idle_connections": idle}
+    return stats
+
+
+async def close_llm_clients():
+    """Closes the pooled httpx clients of every registered LLM client."""
+    for entry in _client_registry.values():
+        for http_client in entry["http_clients"]:
+            if isinstance(http_client, httpx.AsyncClient):
+                await http_client.aclose()
+            else:
+                http_client.close()
+    _client_registry.clear()
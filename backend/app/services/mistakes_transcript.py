@@ -1,7 +1,101 @@
 from app.db.mongodb import get_database
 
 
+def build_mistake_docs(user_id: str, quiz: dict, responses: list, attempt_id: str, attempted_at) -> list:
+    """Compact user_mistakes documents for every wrong answer in an attempt."""
+    question_map = {q["question_id"]: q for q in quiz.get("questions", [])}
+    mistake_docs = []
+    for response in responses:
+        question = question_map.get(response.get("question_id"))
+        selected_choice_id = response.get("selected_choice_id")
+        if not question or not selected_choice_id or selected_choice_id == question.get("correct_choice_id"):
+            continue
+
+        choices = {c.get("choice_id"): c for c in question.get("choices", [])}
+        selected_choice = choices.get(selected_choice_id) or {}
+        correct_choice = choices.get(question.get("correct_choice_id")) or {}
+        mistake_docs.append({
+            "user_id": user_id,
+            "quiz_id": quiz["quiz_id"],
+            "attempt_id": attempt_id,
+            "question_id": question["question_id"],
+            "question_text": question.get("question_text", ""),
+            "selected_choice_text": selected_choice.get("choice_text", ""),
+            "correct_choice_text": correct_choice.get("choice_text", ""),
+            "answer_explanation": question.get("answer_explanation", ""),
+            "attempted_at": attempted_at,
+        })
+    return mistake_docs
+
+
+async def record_mistakes(user_id: str, quiz: dict, responses: list, attempt_id: str, attempted_at):
+    """Writes an attempt's wrong answers to user_mistakes. Failures are logged, not raised."""
+    mistake_docs = build_mistake_docs(user_id, quiz, responses, attempt_id, attempted_at)
+    if not mistake_docs:
+        return
+    try:
+        await get_database().user_mistakes.insert_many(mistake_docs, ordered=False)
+    except Exception as e:
+        print(f"Warning: could not record mistakes for attempt {attempt_id}: {e}")
+
+
+def format_mistake_context(question_text, selected_text, correct_text, explanation) -> str:
+    return (
+        f"Question: {question_text or 'N/A'}\n"
+        f"User's incorrect answer: {selected_text or 'N/A'}\n"
+        f"Correct answer: {correct_text or 'N/A'}\n"
+        f"Explanation: {explanation or 'N/A'}"
+    )
+
+
 async def get_mistake_context_transcript(user_id: str, max_mistakes: int = 5) -> str:
+    """
+    Builds the practice-quiz context from the user's most recent distinct mistakes,
+    read from the materialized user_mistakes collection with one indexed range read.
+    Attempts that predate the collection are materialized by app.db.backfill_user_mistakes;
+    until it has run, users with no materialized mistakes fall back to their attempt history.
+    """
+    db = get_database()
+    try:
+        recent_mistakes = await db.user_mistakes.find(
+            {"user_id": user_id},
+            {"_id": 0, "question_id": 1, "question_text": 1, "selected_choice_text": 1,
+             "correct_choice_text": 1, "answer_explanation": 1}
+        ).sort("attempted_at", -1).limit(max_mistakes * 5).to_list(length=max_mistakes * 5)
+    except Exception as e:
+        raise ValueError(f"Database error fetching mistakes: {e}") from e
+
+    if not recent_mistakes:
+        return await _get_mistake_context_from_attempts(user_id, max_mistakes)
+
+    mistake_contexts = []
+    processed_q_ids = set()
+    for mistake in recent_mistakes:
+        if len(mistake_contexts) >= max_mistakes:
+            break
+        question_id = mistake.get("question_id")
+        if question_id in processed_q_ids:
+            continue
+        processed_q_ids.add(question_id)
+
+        if mistake.get("question_text") and mistake.get("selected_choice_text") and mistake.get("correct_choice_text"):
+            mistake_contexts.append(format_mistake_context(
+                mistake["question_text"],
+                mistake["selected_choice_text"],
+                mistake["correct_choice_text"],
+                mistake.get("answer_explanation"),
+            ))
+        else:
+            print(f"Skipping context for question {question_id} due to missing data.")
+
+    if not mistake_contexts:
+        raise ValueError("Could not construct context from past mistakes (missing or inconsistent data?).")
+
+    return "\n\n---\n\n".join(mistake_contexts)
+
+
+async def _get_mistake_context_from_attempts(user_id: str, max_mistakes: int = 5) -> str:
+    """Legacy path for attempts recorded before user_mistakes existed."""
     db = get_database()
     pipeline_embedded = [
         {'$match': {'user_id': user_id, 'responses.is_correct': False}},
@@ -64,12 +158,12 @@ async def get_mistake_context_transcript(user_id: str, max_mistakes: int = 5) ->
         correct_choice = next((c for c in question.get('choices', []) if c.get('choice_id') == question.get('correct_choice_id')), None)
 
         if selected_choice and correct_choice and question.get('question_text') and selected_choice.get('choice_text') and correct_choice.get('choice_text'):
-            mistake_contexts.append(
-                f"Question: {question.get('question_text', 'N/A')}\n"
-                f"User's incorrect answer: {selected_choice.get('choice_text', 'N/A')}\n"
-                f"Correct answer: {correct_choice.get('choice_text', 'N/A')}\n"
-                f"Explanation: {question.get('answer_explanation', 'N/A')}"
-            )
+            mistake_contexts.append(format_mistake_context(
+                question.get('question_text'),
+                selected_choice.get('choice_text'),
+                correct_choice.get('choice_text'),
+                question.get('answer_explanation'),
+            ))
             added_count += 1
         else:
             print(f"Skipping context for question {question_id} due to missing data.")
@@ -0,0 +1,66 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from passlib.context import CryptContext
+from app.config import config
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=config.BCRYPT_ROUNDS,
+)
+
+# bcrypt releases the GIL, so a thread per core lets hashing scale across cores
+_max_workers = config.PASSWORD_HASH_WORKERS or os.cpu_count() or 1
+_executor: Optional[ThreadPoolExecutor] = None
+_stats = {"pending": 0, "max_pending": 0, "completed": 0}
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=_max_workers, thread_name_prefix="bcrypt")
+    return _executor
+
+
+async def _run_in_hash_pool(func, *args):
+    loop = asyncio.get_running_loop()
+    _stats["pending"] += 1
+    _stats["max_pending"] = max(_stats["max_pending"], _stats["pending"])
+    try:
+        return await loop.run_in_executor(_get_executor(), func, *args)
+    finally:
+        _stats["pending"] -= 1
+        _stats["completed"] += 1
+
+
+async def verify_password(plain_password, hashed_password) -> bool:
+    return await _run_in_hash_pool(pwd_context.verify, plain_password, hashed_password)
+
+
+async def get_password_hash(password) -> str:
+    return await _run_in_hash_pool(pwd_context.hash, password)
+
+
+def password_needs_update(hashed_password) -> bool:
+    return pwd_context.needs_update(hashed_password)
+
+
+def shutdown_password_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def get_password_hashing_stats() -> dict:
+    # Anything beyond the worker count is waiting in the executor queue
+    return {
+        "workers": _max_workers,
+        "in_flight": _stats["pending"],
+        "queue_depth": max(0, _stats["pending"] - _max_workers),
+        "max_in_flight": _stats["max_pending"],
+        "completed": _stats["completed"],
+        "bcrypt_rounds": config.BCRYPT_ROUNDS,
+    }
@@ -0,0 +1,72 @@
+from cachetools import TTLCache
+from app.config import config
+from app.db.mongodb import get_database
+from app.services.single_flight import single_flight
+
+# Counters change on every attempt, so they are never served from the cache
+QUIZ_CACHE_PROJECTION = {"_id": 0, "attempt_count": 0, "last_attempted_at": 0, "best_score": 0}
+
+_quiz_cache = TTLCache(maxsize=config.QUIZ_CACHE_SIZE, ttl=config.QUIZ_CACHE_TTL_SECONDS)
+_stats = {"hits": 0, "misses": 0}
+
+
+def _strip_answers(quiz: dict) -> dict:
+    """The quiz as shown to someone taking it: no answers, explanations or metadata."""
+    public_quiz = {k: v for k, v in quiz.items() if k != "metadata"}
+    public_quiz["questions"] = [
+        {
+            **{k: v for k, v in question.items() if k not in ("correct_choice_id", "answer_explanation")},
+            "choices": [
+                {k: v for k, v in choice.items() if k != "choice_explanation"}
+                for choice in question.get("choices", [])
+            ],
+        }
+        for question in quiz.get("questions", [])
+    ]
+    return public_quiz
+
+
+def _build_entry(quiz: dict) -> dict:
+    return {
+        "quiz": quiz,
+        "public_quiz": _strip_answers(quiz),
+        "question_map": {q["question_id"]: q for q in quiz.get("questions", [])},
+    }
+
+
+async def _load_quiz(quiz_id: str):
+    quiz = await get_database().quizzes.find_one({"quiz_id": quiz_id}, QUIZ_CACHE_PROJECTION)
+    if not quiz:
+        return None
+    entry = _build_entry(quiz)
+    _quiz_cache[quiz_id] = entry
+    return entry
+
+
+async def get_cached_quiz(quiz_id: str):
+    """
+    Returns {"quiz", "public_quiz", "question_map"} for a quiz, or None if it does not exist.
+    Entries are shared between requests and must be treated as read-only.
+    Concurrent misses for the same quiz share a single database read.
+    """
+    entry = _quiz_cache.get(quiz_id)
+    if entry is not None:
+        _stats["hits"] += 1
+        return entry
+
+    _stats["misses"] += 1
+    return await single_flight(f"quiz:{quiz_id}", lambda: _load_quiz(quiz_id))
+
+
+def invalidate_quiz(quiz_id: str):
+    """Drops a quiz from this worker's cache. Other workers expire it after QUIZ_CACHE_TTL_SECONDS."""
+    _quiz_cache.pop(quiz_id, None)
+
+
+def get_quiz_cache_stats() -> dict:
+    lookups = _stats["hits"] + _stats["misses"]
+    return {
+        **_stats,
+        "size": len(_quiz_cache),
+        "hit_ratio": round(_stats["hits"] / lookups, 4) if lookups else 0.0,
+    }
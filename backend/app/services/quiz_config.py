@@ -14,18 +14,18 @@ PROMPT_TEMPLATES = {
     "quiz_easy": (
         "Generate an easy quiz with {num_questions} questions on the topic derived from the following input. "
         "Ensure questions cover fundamental concepts. Format the output as JSON:\n"
-        "{format_instructions}\n\nInput Text:\n{input_text}"
+        "{format_instructions}\n\nInput Text:\n{input_text}\n\n{additional_instructions}"
     ),
     "quiz_hard": (
         "Generate a challenging quiz with {num_questions} questions on the topic derived from the following input. "
         "Focus on advanced concepts, nuances, or complex applications. Format the output as JSON:\n"
-        "{format_instructions}\n\nInput Text:\n{input_text}"
+        "{format_instructions}\n\nInput Text:\n{input_text}\n\n{additional_instructions}"
     ),
     "quiz_from_mistakes": (
         "Analyze the following text which contains mistakes i made in a lot of quizzes."
         "Generate a quiz with {num_questions} questions specifically designed to test understanding and correct these mistakes. "
         "Format the output as JSON:\n"
-        "{format_instructions}\n\nInput Text (containing mistakes):\n{input_text}"
+        "{format_instructions}\n\nInput Text (containing mistakes):\n{input_text}\n\n{additional_instructions}"
     ),
     
     # Summary templates
@@ -69,6 +69,34 @@ PROMPT_TEMPLATES = {
         "Also include 4 thought-provoking questions with answers related to the content.\n\n"
         "{format_instructions}"
     ),
+
+    # Chunked (map-reduce) summary templates
+    "summarize_chunk": (
+        "The following is part {chunk_index} of {chunk_count} of a longer text.\n\n"
+        "{input_text}\n\n"
+        "{additional_instructions}\n\n"
+        "Write detailed notes on this part only:\n"
+        "- Keep every key point, definition, example and conclusion\n"
+        "- Keep names, numbers and technical terms exactly as written\n"
+        "- Do not add an introduction or refer to other parts\n"
+        "- Use concise markdown bullet points"
+    ),
+    "summarize_chunk_notes": (
+        "Create a summary from the following notes, which were taken in order "
+        "from consecutive parts of one longer text:\n\n"
+        "{input_text}\n\n"
+        "Length: {length}\n"
+        "{additional_instructions}\n\n"
+        "The summary should:\n"
+        "- Cover the whole text, not only the first parts\n"
+        "- Merge points repeated across notes\n"
+        "- Be well-structured with clear paragraphs\n"
+        "- Use markdown formatting for better readability\n\n"
+        "Also include 4 thought-provoking questions with answers related to the content.\n\n"
+        "{format_instructions}"
+    ),
+    # Plain-text templates
+    "simple_explanation_template": "Explain the following concept to {target_audience}:\n\n{input_text}",
 }
 
 TASK_CONFIGURATIONS = {
@@ -76,58 +104,62 @@ TASK_CONFIGURATIONS = {
         "schema_name": "quiz",
         "model_config_name": "groq_llama3_70b_fast", # Use a precise model for easy qns
         "prompt_template_name": "quiz_easy",
-        "prompt_input_variables": ["input_text", "num_questions"], # Vars expected by the template (excluding format_instructions)
-        "default_params": {"num_questions": 5}, # Default values for prompt vars
+        "prompt_input_variables": ["input_text", "num_questions", "additional_instructions"], # Vars expected by the template (excluding format_instructions)
+        "default_params": {"num_questions": 5, "additional_instructions": ""}, # Default values for prompt vars
     },
     "quiz_medium_general": {
         "schema_name": "quiz",
         "model_config_name": "gemini_flash_2_strict", # Allow a bit more creativity/flexibility
         "prompt_template_name": "quiz_easy", # Reuse 'easy' template, difficulty comes from model/temp maybe? Or define quiz_medium template
-        "prompt_input_variables": ["input_text", "num_questions"],
-        "default_params": {"num_questions": 7},
+        "prompt_input_variables": ["input_text", "num_questions", "additional_instructions"],
+        "default_params": {"num_questions": 7, "additional_instructions": ""},
     },
     "quiz_hard_general": {
         "schema_name": "quiz",
         "model_config_name": "gemini_flash_2_strict", # Use a more capable/creative model for hard qns
         "prompt_template_name": "quiz_hard",
-        "prompt_input_variables": ["input_text", "num_questions"],
-        "default_params": {"num_questions": 5},
+        "prompt_input_variables": ["input_text", "num_questions", "additional_instructions"],
+        "default_params": {"num_questions": 5, "additional_instructions": ""},
     },
     "quiz_hard_fast_experimental": { # Example using a different provider
         "schema_name": "quiz",
         "model_config_name": "groq_llama3_70b_fast",
         "prompt_template_name": "quiz_hard",
-        "prompt_input_variables": ["input_text", "num_questions"],
-        "default_params": {"num_questions": 5},
+        "prompt_input_variables": ["input_text", "num_questions", "additional_instructions"],
+        "default_params": {"num_questions": 5, "additional_instructions": ""},
     },
     "quiz_from_mistakes_analysis": {
         "schema_name": "quiz",
         "model_config_name": "gemini_flash_2_strict", # Need precise analysis
         "prompt_template_name": "quiz_from_mistakes",
-        "prompt_input_variables": ["input_text", "num_questions"],
-        "default_params": {"num_questions": 3},
+        "prompt_input_variables": ["input_text", "num_questions", "additional_instructions"],
+        "default_params": {"num_questions": 3, "additional_instructions": ""},
     },
 
     # --- Summary Tasks ---
+    # Summaries are deterministic for a given source, so identical prompts reuse the
+    # cached LLM response. Quiz tasks are not cached: regenerating must give a new quiz.
     "summary_general": {
         "schema_name": "summary",
         "model_config_name": "gemini_flash_2_strict", # Fast and cheap for summaries
         "prompt_template_name": "summary_detailed",
-        "prompt_input_variables": ["input_text"],
-        "default_params": {},
+        "prompt_input_variables": ["input_text", "length", "additional_instructions"],
+        "default_params": {"length": "Medium (3-5 paragraphs)", "additional_instructions": ""},
+        "cache_responses": True,
     },
     "summary_youtube": {
         "schema_name": "summary",
         "model_config_name": "gemini_flash_2_strict", # Example: Use fast Groq for YT summaries
         "prompt_template_name": "summarize_youtube_transcript", # Source-specific prompt
-        "prompt_input_variables": ["input_text"],
-        "default_params": {},
+        "prompt_input_variables": ["input_text", "length", "additional_instructions"],
+        "default_params": {"length": "Medium (3-5 paragraphs)", "additional_instructions": ""},
+        "cache_responses": True,
     },
 
     "simple_explanation": {
         "schema_name": "raw_text",  # No Pydantic parsing needed
         "model_config_name": "gemini_flash_2_strict",
-        "prompt_template_name": "simple_explanation_template", # Assume this template exists in PROMPT_TEMPLATES
+        "prompt_template_name": "simple_explanation_template",
         "prompt_input_variables": ["input_text", "target_audience"],
         "default_params": {"target_audience": "a 5 year old"},
      },
@@ -139,6 +171,7 @@ TASK_CONFIGURATIONS = {
         "prompt_template_name": "summary_detailed",
         "prompt_input_variables": ["input_text", "length", "additional_instructions"],
         "default_params": {"length": "Short (2-3 paragraphs)", "additional_instructions": ""},
+        "cache_responses": True,
     },
     "summary_medium": {
         "schema_name": "summary",
@@ -146,6 +179,7 @@ TASK_CONFIGURATIONS = {
         "prompt_template_name": "summary_detailed",
         "prompt_input_variables": ["input_text", "length", "additional_instructions"],
         "default_params": {"length": "Medium (3-5 paragraphs)", "additional_instructions": ""},
+        "cache_responses": True,
     },
     "summary_long": {
         "schema_name": "summary",
@@ -153,6 +187,7 @@ TASK_CONFIGURATIONS = {
         "prompt_template_name": "summary_detailed",
         "prompt_input_variables": ["input_text", "length", "additional_instructions"],
         "default_params": {"length": "Long (5-8 paragraphs)", "additional_instructions": ""},
+        "cache_responses": True,
     },
     "summary_youtube_short": {
         "schema_name": "summary",
@@ -160,6 +195,7 @@ TASK_CONFIGURATIONS = {
         "prompt_template_name": "summarize_youtube_transcript",
         "prompt_input_variables": ["input_text", "length", "additional_instructions"],
         "default_params": {"length": "Short (2-3 paragraphs)", "additional_instructions": ""},
+        "cache_responses": True,
     },
     "summary_youtube_medium": {
         "schema_name": "summary",
@@ -167,6 +203,7 @@ TASK_CONFIGURATIONS = {
         "prompt_template_name": "summarize_youtube_transcript",
         "prompt_input_variables": ["input_text", "length", "additional_instructions"],
         "default_params": {"length": "Medium (3-5 paragraphs)", "additional_instructions": ""},
+        "cache_responses": True,
     },
     "summary_article_medium": {
         "schema_name": "summary",
@@ -174,10 +211,25 @@ TASK_CONFIGURATIONS = {
         "prompt_template_name": "summarize_article",
         "prompt_input_variables": ["input_text", "length", "additional_instructions"],
         "default_params": {"length": "Medium (3-5 paragraphs)", "additional_instructions": ""},
+        "cache_responses": True,
     },
 
+    # Chunked summary tasks, used for content over the direct task's input_token_budget
+    "summary_chunk_map": {
+        "schema_name": "raw_text",
+        "model_config_name": "gemini_flash_2_strict",
+        "prompt_template_name": "summarize_chunk",
+        "prompt_input_variables": ["input_text", "chunk_index", "chunk_count", "additional_instructions"],
+        "default_params": {"additional_instructions": ""},
+        "cache_responses": True,
+    },
+    "summary_chunk_reduce": {
+        "schema_name": "summary",
+        "model_config_name": "gemini_flash_2_strict",
+        "prompt_template_name": "summarize_chunk_notes",
+        "prompt_input_variables": ["input_text", "length", "additional_instructions"],
+        "default_params": {"length": "Medium (3-5 paragraphs)", "additional_instructions": ""},
+        "cache_responses": True,
+    },
     # Add configurations for other tasks (flashcards, analysis, etc.)
 }
-
-# Add the 'simple_explanation_template' to PROMPT_TEMPLATES if using the above example
-# PROMPT_TEMPLATES["simple_explanation_template"] = "Explain the following concept to {target_audience}:\n\n{input_text}"
\ No newline at end of file
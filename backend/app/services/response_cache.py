@@ -0,0 +1,96 @@
+import hashlib
+import json
+from datetime import datetime, timedelta
+from cachetools import TTLCache
+from app.config import config
+from app.db.mongodb import get_database
+from app.llm_config import MODEL_CONFIGS
+
+RESPONSE_CACHE_COLLECTION = "llm_response_cache"
+
+_memory_cache = TTLCache(
+    maxsize=config.LLM_RESPONSE_CACHE_SIZE,
+    ttl=config.LLM_RESPONSE_CACHE_TTL_SECONDS,
+)
+_stats = {"memory_hits": 0, "db_hits": 0, "misses": 0}
+_task_stats = {}
+
+
+def make_cache_key(task: str, model_config_name: str, formatted_prompt: str) -> str:
+    """Hashes the task, the full model config and the formatted prompt."""
+    model_config = json.dumps(MODEL_CONFIGS.get(model_config_name, {}), sort_keys=True)
+    payload = "\x1f".join([task, model_config_name, model_config, formatted_prompt])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _record(task: str, outcome: str):
+    _stats[outcome] += 1
+    task_stats = _task_stats.setdefault(task, {"hits": 0, "misses": 0})
+    task_stats["misses" if outcome == "misses" else "hits"] += 1
+
+
+def get_cached_response(task: str, key: str):
+    """Memory-only lookup for the sync generate_response path."""
+    raw_content = _memory_cache.get(key)
+    _record(task, "memory_hits" if raw_content is not None else "misses")
+    return raw_content
+
+
+def set_cached_response(key: str, raw_content: str):
+    _memory_cache[key] = raw_content
+
+
+async def aget_cached_response(task: str, key: str):
+    raw_content = _memory_cache.get(key)
+    if raw_content is not None:
+        _record(task, "memory_hits")
+        return raw_content
+
+    if config.LLM_RESPONSE_CACHE_USE_MONGO:
+        try:
+            doc = await get_database()[RESPONSE_CACHE_COLLECTION].find_one(
+                {"key": key, "expires_at": {"$gt": datetime.utcnow()}},
+                {"_id": 0, "response": 1}
+            )
+        except Exception as e:
+            print(f"Warning: response cache read failed: {e}")
+            doc = None
+        if doc:
+            _record(task, "db_hits")
+            _memory_cache[key] = doc["response"]
+            return doc["response"]
+
+    _record(task, "misses")
+    return None
+
+
+async def aset_cached_response(task: str, key: str, raw_content: str):
+    _memory_cache[key] = raw_content
+    if not config.LLM_RESPONSE_CACHE_USE_MONGO:
+        return
+
+    now = datetime.utcnow()
+    try:
+        await get_database()[RESPONSE_CACHE_COLLECTION].update_one(
+            {"key": key},
+            {"$set": {
+                "task": task,
+                "response": raw_content,
+                "created_at": now,
+                "expires_at": now + timedelta(seconds=config.LLM_RESPONSE_CACHE_TTL_SECONDS),
+            }},
+            upsert=True
+        )
+    except Exception as e:
+        print(f"Warning: response cache write failed: {e}")
+
+
+def get_response_cache_stats() -> dict:
+    lookups = _stats["memory_hits"] + _stats["db_hits"] + _stats["misses"]
+    hits = _stats["memory_hits"] + _stats["db_hits"]
+    return {
+        **_stats,
+        "memory_size": len(_memory_cache),
+        "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+        "by_task": _task_stats,
+    }
@@ -0,0 +1,46 @@
+import asyncio
+from urllib.parse import urlsplit, urlunsplit
+from app.models.common_schemas import SourceTypes
+from app.services.youtube import get_video_id
+
+_in_flight = {}
+_stats = {"leaders": 0, "coalesced": 0}
+
+
+def get_source_key(source_type, source_url: str) -> str:
+    """Normalizes a source URL so equivalent links share one in-flight fetch."""
+    source_url = (source_url or "").strip()
+    if source_type == SourceTypes.YOUTUBE:
+        video_id = get_video_id(source_url)
+        if video_id:
+            return f"youtube:{video_id}"
+    parts = urlsplit(source_url)
+    normalized = urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, parts.query, ""))
+    return f"{source_type}:{normalized}"
+
+
+def _release(key: str, task):
+    if _in_flight.get(key) is task:
+        del _in_flight[key]
+
+
+async def single_flight(key: str, fetch_func):
+    """
+    Runs fetch_func() once per key at a time. Concurrent callers with the same key
+    await the same task and share its result or exception.
+    """
+    task = _in_flight.get(key)
+    if task is None:
+        _stats["leaders"] += 1
+        task = asyncio.ensure_future(fetch_func())
+        _in_flight[key] = task
+        task.add_done_callback(lambda done: _release(key, done))
+    else:
+        _stats["coalesced"] += 1
+
+    # Shield so a cancelled caller does not cancel the fetch for everyone else
+    return await asyncio.shield(task)
+
+
+def get_single_flight_stats() -> dict:
+    return {**_stats, "in_flight": len(_in_flight)}
@@ -0,0 +1,171 @@
+from string import Formatter
+from typing import Any, Dict, Optional, Tuple
+from app.services.quiz_config import TASK_CONFIGURATIONS, SCHEMAS, PROMPT_TEMPLATES
+from app.llm_config import MODEL_CONFIGS
+from app.services.llm_factory import get_registered_llm_client, warm_up_llm_client
+from app.services.token_budget import count_tokens, compress_to_budget
+
+
+class CompiledTask:
+    """
+    A task resolved once into its prompt template, parser and model handle.
+    The parser is built on first use so compiling does not import langchain.
+    """
+
+    def __init__(self, name, template, schema_name,
+                 model_config_name, input_variables, default_params, cache_responses=False,
+                 input_token_budget=None):
+        self.name = name
+        self.template = template
+        self.schema_name = schema_name
+        self.model_config_name = model_config_name
+        self.input_variables = set(input_variables)
+        self.default_params = default_params
+        self.cache_responses = cache_responses
+        self.input_token_budget = input_token_budget
+
+    @property
+    def parser(self):
+        return _get_parser(self.schema_name)[0]
+
+    @property
+    def format_instructions(self) -> str:
+        return _get_parser(self.schema_name)[1]
+
+    def get_model(self):
+        return get_registered_llm_client(self.model_config_name)
+
+    def format_prompt(self, **kwargs: Any) -> str:
+        # Merge default params with provided kwargs, kwargs take precedence
+        prompt_inputs = {**self.default_params, **kwargs}
+
+        missing_vars = self.input_variables - set(prompt_inputs.keys())
+        if missing_vars:
+            raise ValueError(f"Missing required input variables for task '{self.name}': {missing_vars}")
+
+        format_args = {k: v for k, v in prompt_inputs.items() if k in self.input_variables}
+        try:
+            return self.template.format(format_instructions=self.format_instructions, **format_args)
+        except KeyError as e:
+            raise ValueError(f"Error formatting prompt for task '{self.name}'. Missing key: {e}. Provided: {prompt_inputs.keys()}") from e
+
+    def input_text_budget(self, **kwargs: Any) -> Optional[int]:
+        """Tokens left for input_text once the rest of the prompt is formatted; None without a budget."""
+        if not self.input_token_budget:
+            return None
+        return self.input_token_budget - count_tokens(self.format_prompt(**{**kwargs, "input_text": ""}))
+
+    def fit_prompt(self, input_tokens: Optional[int] = None, **kwargs: Any) -> Tuple[str, dict]:
+        """
+        Formats the prompt, first compressing input_text when the prompt would exceed the
+        model's input_token_budget. Returns (prompt, stats) with the estimated input tokens.
+        Callers that already counted input_text pass input_tokens so it is not counted again.
+        """
+        prompt = self.format_prompt(**kwargs)
+        input_text = kwargs.get("input_text")
+        if input_tokens is None or not input_text:
+            tokens = count_tokens(prompt)
+            input_tokens = None
+        else:
+            # Only the rest of the prompt, which is short, still needs counting
+            tokens = count_tokens(self.format_prompt(**{**kwargs, "input_text": ""})) + input_tokens
+        stats = {"estimated_input_tokens": tokens, "input_compressed": False}
+
+        if not self.input_token_budget or tokens <= self.input_token_budget or not input_text:
+            return prompt, stats
+
+        if input_tokens is None:
+            input_tokens = count_tokens(input_text)
+        available = self.input_token_budget - (tokens - input_tokens)
+        if available <= 0:
+            raise ValueError(f"Prompt for task '{self.name}' exceeds the token budget even without input text.")
+
+        prompt = self.format_prompt(**{**kwargs, "input_text": compress_to_budget(input_text, available)})
+        stats = {
+            "estimated_input_tokens": count_tokens(prompt),
+            "input_compressed": True,
+            "original_input_tokens": tokens,
+        }
+        print(f"Compressed input for task '{self.name}' from {tokens} to {stats['estimated_input_tokens']} tokens")
+        return prompt, stats
+
+
+_compiled_tasks: Dict[str, CompiledTask] = {}
+_parsers_by_schema: Dict[str, tuple] = {}
+
+
+def _get_parser(schema_name: str):
+    """Parsers and their format instructions are shared by every task using the same schema."""
+    if schema_name not in _parsers_by_schema:
+        schema = SCHEMAS[schema_name]
+        if schema:
+            from langchain.output_parsers import PydanticOutputParser
+            parser = PydanticOutputParser(pydantic_object=schema)
+            _parsers_by_schema[schema_name] = (parser, parser.get_format_instructions())
+        else:
+            _parsers_by_schema[schema_name] = (None, "")
+    return _parsers_by_schema[schema_name]
+
+
+def compile_task(task: str, task_config: dict) -> CompiledTask:
+    schema_name = task_config.get("schema_name")
+    model_config_name = task_config.get("model_config_name")
+    prompt_template_name = task_config.get("prompt_template_name")
+    prompt_input_vars = task_config.get("prompt_input_variables", [])
+
+    if schema_name not in SCHEMAS:
+        raise ValueError(f"Schema '{schema_name}' not found for task '{task}'.")
+    if model_config_name not in MODEL_CONFIGS:
+        raise ValueError(f"Model configuration '{model_config_name}' not found for task '{task}'.")
+    template_str = PROMPT_TEMPLATES.get(prompt_template_name)
+    if not template_str:
+        raise ValueError(f"Prompt template '{prompt_template_name}' not found for task '{task}'.")
+
+    template_fields = {field for _, field, _, _ in Formatter().parse(template_str) if field}
+    undeclared = template_fields - set(prompt_input_vars) - {"format_instructions"}
+    if undeclared:
+        raise ValueError(f"Prompt template '{prompt_template_name}' uses variables not declared by task '{task}': {undeclared}")
+
+    return CompiledTask(
+        name=task,
+        template=template_str,
+        schema_name=schema_name,
+        model_config_name=model_config_name,
+        input_variables=prompt_input_vars,
+        default_params=task_config.get("default_params", {}),
+        cache_responses=task_config.get("cache_responses", False),
+        input_token_budget=MODEL_CONFIGS[model_config_name].get("input_token_budget"),
+    )
+
+
+def build_task_registry():
+    """Compiles every entry in TASK_CONFIGURATIONS. Raises ValueError on a broken config."""
+    compiled = {task: compile_task(task, task_config) for task, task_config in TASK_CONFIGURATIONS.items()}
+    _compiled_tasks.clear()
+    _compiled_tasks.update(compiled)
+    print(f"Compiled {len(_compiled_tasks)} LLM tasks")
+
+
+def warm_up_task_registry():
+    """
+    Imports the parser, tokenizer and provider SDKs every compiled task needs and
+    builds the shared LLM clients. Blocking; run it off the event loop after startup so the
+    first LLM request does not pay for the imports.
+    """
+    if not _compiled_tasks:
+        build_task_registry()
+    for compiled in list(_compiled_tasks.values()):
+        _get_parser(compiled.schema_name)
+        warm_up_llm_client(compiled.model_config_name)
+    # Loads the tokenizer used by the pre-flight token count
+    count_tokens("warm up")
+    print("LLM task registry warmed up")
+
+
+def get_compiled_task(task: str) -> CompiledTask:
+    if not _compiled_tasks:
+        build_task_registry()
+    compiled = _compiled_tasks.get(task)
+    if not compiled:
+        raise ValueError(f"Unknown task: {task}")
+    return compiled
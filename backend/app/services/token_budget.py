@@ -0,0 +1,113 @@
+import math
+import re
+from app.config import config
+
+# Verbal fillers and caption cues that carry no content
+_FILLER_PATTERN = re.compile(
+    r"\[(?:music|applause|laughter|inaudible|silence|noise)\]|\b(?:um+|uh+|erm+|hmm+|ah+)\b[,.]?",
+    re.IGNORECASE,
+)
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+_OMISSION_MARKER = "\n[...]\n"
+
+_encoding = None
+_encoding_failed = False
+
+
+def _get_encoding():
+    """Loads the tiktoken encoding on first use; None when it is unavailable (e.g. no cached BPE file offline)."""
+    global _encoding, _encoding_failed
+    if _encoding is None and not _encoding_failed:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding(config.TOKENIZER_ENCODING)
+        except Exception as e:
+            _encoding_failed = True
+            print(f"Warning: tiktoken unavailable, estimating tokens from length: {e}")
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """
+    Estimated token count. Gemini and Llama tokenizers are not public, so a tiktoken
+    encoding is used as a close approximation for every provider.
+    """
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return math.ceil(len(text) / 4)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _split_units(text: str) -> list:
+    """Lines, or sentences when the text is one long line (as transcripts usually are)."""
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    if len(lines) >= config.TOKEN_BUDGET_SECTIONS * 2:
+        return lines
+    return [unit.strip() for unit in _SENTENCE_BOUNDARY.split(" ".join(lines)) if unit.strip()]
+
+
+def dedupe_units(units: list) -> list:
+    """Drops repeated lines, keeping the first occurrence."""
+    seen = set()
+    kept = []
+    for unit in units:
+        key = " ".join(unit.lower().split())
+        if key in seen:
+            continue
+        seen.add(key)
+        kept.append(unit)
+    return kept
+
+
+def strip_filler(unit: str) -> str:
+    return " ".join(_FILLER_PATTERN.sub("", unit).split())
+
+
+def sample_sections(units: list, keep_ratio: float) -> str:
+    """
+    Splits units into TOKEN_BUDGET_SECTIONS equal sections and keeps the leading
+    keep_ratio of each, so the whole input stays represented rather than just its start.
+    """
+    section_count = min(config.TOKEN_BUDGET_SECTIONS, len(units))
+    section_size = math.ceil(len(units) / section_count)
+    sections = []
+    for start in range(0, len(units), section_size):
+        section = units[start:start + section_size]
+        keep = max(1, math.floor(len(section) * keep_ratio))
+        sections.append(" ".join(section[:keep]))
+    return _OMISSION_MARKER.join(sections)
+
+
+def _truncate_to_tokens(text: str, max_tokens: int) -> str:
+    encoding = _get_encoding()
+    if encoding is None:
+        return text[:max_tokens * 4]
+    return encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens])
+
+
+def compress_to_budget(text: str, max_tokens: int) -> str:
+    """
+    Deterministically shrinks text to at most max_tokens: repeated lines are dropped,
+    fillers stripped, then sections are sampled evenly. Returns text unchanged if it fits.
+    """
+    if count_tokens(text) <= max_tokens:
+        return text
+
+    units = [unit for unit in (strip_filler(u) for u in dedupe_units(_split_units(text))) if unit]
+    compressed = " ".join(units)
+    tokens = count_tokens(compressed)
+    if tokens <= max_tokens:
+        return compressed
+
+    keep_ratio = 1.0
+    for _ in range(5):
+        # Aim slightly under budget to absorb the omission markers
+        keep_ratio *= max_tokens / tokens * 0.95
+        compressed = sample_sections(units, keep_ratio)
+        tokens = count_tokens(compressed)
+        if tokens <= max_tokens:
+            return compressed
+
+    return _truncate_to_tokens(compressed, max_tokens)
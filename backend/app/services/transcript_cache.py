@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+from cachetools import TTLCache
+from app.config import config
+from app.db.mongodb import get_database
+from app.services.youtube import get_video_id, get_transcript
+
+TRANSCRIPT_COLLECTION = "transcripts"
+
+# In-process LRU tier, sits in front of the Mongo tier
+_memory_cache = TTLCache(
+    maxsize=config.TRANSCRIPT_CACHE_SIZE,
+    ttl=config.TRANSCRIPT_CACHE_TTL_SECONDS,
+)
+_stats = {"memory_hits": 0, "db_hits": 0, "misses": 0}
+
+
+async def get_cached_transcript(yt_url: str):
+    """
+    Returns the transcript for a YouTube URL, checking the in-process cache,
+    then Mongo, and only then calling Supadata. Failed fetches are not cached.
+    """
+    video_id = get_video_id(yt_url)
+    if not video_id:
+        return await get_transcript(yt_url)
+
+    transcript = _memory_cache.get(video_id)
+    if transcript is not None:
+        _stats["memory_hits"] += 1
+        return transcript
+
+    collection = get_database()[TRANSCRIPT_COLLECTION]
+    now = datetime.utcnow()
+    try:
+        # TTL monitor only runs once a minute, so filter on expiry as well
+        doc = await collection.find_one(
+            {"video_id": video_id, "expires_at": {"$gt": now}},
+            {"_id": 0, "transcript": 1}
+        )
+    except Exception as e:
+        print(f"Warning: transcript cache read failed for {video_id}: {e}")
+        doc = None
+
+    if doc and doc.get("transcript"):
+        _stats["db_hits"] += 1
+        _memory_cache[video_id] = doc["transcript"]
+        return doc["transcript"]
+
+    _stats["misses"] += 1
+    transcript = await get_transcript(yt_url)
+    if not transcript:
+        return None
+
+    _memory_cache[video_id] = transcript
+    try:
+        await collection.update_one(
+            {"video_id": video_id},
+            {"$set": {
+                "transcript": transcript,
+                "created_at": now,
+                "expires_at": now + timedelta(seconds=config.TRANSCRIPT_CACHE_TTL_SECONDS),
+            }},
+            upsert=True
+        )
+    except Exception as e:
+        print(f"Warning: transcript cache write failed for {video_id}: {e}")
+
+    return transcript
+
+
+def get_transcript_cache_stats() -> dict:
+    lookups = _stats["memory_hits"] + _stats["db_hits"] + _stats["misses"]
+    hits = _stats["memory_hits"] + _stats["db_hits"]
+    return {
+        **_stats,
+        "memory_size": len(_memory_cache),
+        "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+    }
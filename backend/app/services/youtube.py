@@ -1,10 +1,19 @@
 import subprocess
 import os
-import requests
+import httpx
 from app.config import config
+from app.services.http_client import fetch
 
 
-def get_transcript(yt_url: str):
+class TranscriptUnavailableError(ValueError):
+    """Supadata answered that the video has no transcript, as opposed to failing to answer."""
+
+
+async def get_transcript(yt_url: str):
+    """
+    The video's English transcript, or None when Supadata could not be reached or
+    rejected the request. Raises TranscriptUnavailableError when the video has none.
+    """
     endpoint = "https://api.supadata.ai/v1/youtube/transcript"
     params = {
         "url": yt_url,
@@ -15,103 +24,126 @@ def get_transcript(yt_url: str):
         "x-api-key": config.SUPADATA_API_KEY
     }
 
-    response = requests.get(endpoint, params=params, headers=headers)
+    try:
+        response = await fetch("GET", endpoint, params=params, headers=headers)
+    except httpx.HTTPError as e:
+        print(f"Error fetching transcript for {yt_url}: {e}")
+        return None
+
     if response.status_code == 200:
         res = response.json()
         return res.get("content")
-    else:
-        return None
+
+    try:
+        error_code = response.json().get("error")
+    except ValueError:
+        error_code = None
+    if error_code == "transcript-unavailable":
+        raise TranscriptUnavailableError(f"No transcript is available for YouTube URL: {yt_url}")
+    return None
 
 
 def get_video_id(url: str) -> str:
     """Extract video ID from YouTube URL."""
+    url = url.strip()
     if "embed/" in url:
-        return url.split("embed/")[-1]
+        return url.split("embed/")[-1].split("?")[0]
     if "watch?v=" in url:
         return url.split("watch?v=")[-1].split("&")[0]
+    if "youtu.be/" in url:
+        return url.split("youtu.be/")[-1].split("?")[0]
     return ""
 
 
-def download_youtube_audio(url, output_file=None):
-    video_id = get_video_id(url)
-    if not video_id:
+def get_audio_duration(url: str):
+    """Duration in seconds as reported by yt-dlp, without downloading. None if unknown (e.g. live streams)."""
+    try:
+        process = subprocess.run(
+            ["yt-dlp", "--skip-download", "--no-playlist", "--no-warnings", "--print", "duration", url],
+            capture_output=True, text=True, timeout=config.AUDIO_METADATA_TIMEOUT_SECONDS
+        )
+    except subprocess.TimeoutExpired:
+        print(f"Timed out reading duration for {url}")
+        return None
+
+    try:
+        return float(process.stdout.strip().splitlines()[-1])
+    except (IndexError, ValueError):
+        print("Error reading duration:", process.stderr)
         return None
 
-    if output_file is None:
-        output_file = f"{video_id}.mp3"
 
-    command = [
-        "yt-dlp",
-        "-f", "bestaudio[abr<=64]",
-        "-o", output_file,
-        "--extract-audio",
-        "--audio-format", "mp3",
-        url
-    ]
+def choose_audio_bitrate_k(duration, max_size_bytes):
+    """Highest bitrate (kbps) that keeps the encoded audio under max_size_bytes, within the configured range."""
+    if not duration:
+        return config.AUDIO_MAX_BITRATE_K
+    # 5% headroom for container overhead
+    bitrate_k = int(max_size_bytes * 8 * 0.95 / duration / 1000)
+    return max(config.AUDIO_MIN_BITRATE_K, min(config.AUDIO_MAX_BITRATE_K, bitrate_k))
 
-    process = subprocess.run(command, capture_output=True, text=True)
 
-    if process.returncode != 0:
-        print("Error downloading audio:", process.stderr)
+def download_youtube_audio(url, output_dir, max_size_bytes=None, duration=None):
+    """
+    Streams the best audio track from yt-dlp straight into ffmpeg, encoding once to
+    a mono mp3 in output_dir at a bitrate picked from the video's duration (looked up
+    unless given). Returns the file path, or None on failure. Blocking; run it in the audio pool.
+    """
+    video_id = get_video_id(url)
+    if not video_id:
         return None
 
-    file_size = os.path.getsize(output_file)
-    if file_size > 19000000:
-        output_file = compress_audio(output_file)
+    max_size_bytes = max_size_bytes or config.AUDIO_MAX_SIZE_BYTES
+    bitrate_k = choose_audio_bitrate_k(duration or get_audio_duration(url), max_size_bytes)
+    output_file = os.path.join(output_dir, f"{video_id}.mp3")
+    log_file = os.path.join(output_dir, "pipeline.log")
+
+    with open(log_file, "w+b") as log:
+        downloader = subprocess.Popen(
+            ["yt-dlp", "-f", "bestaudio", "--no-playlist", "--quiet", "--no-warnings", "-o", "-", url],
+            stdout=subprocess.PIPE, stderr=log
+        )
+        encoder = subprocess.Popen(
+            ["ffmpeg", "-y", "-loglevel", "error", "-i", "pipe:0", "-vn", "-ac", "1",
+             "-b:a", f"{bitrate_k}k", "-f", "mp3", output_file],
+            stdin=downloader.stdout, stderr=log
+        )
+        # Only ffmpeg reads the pipe now, so yt-dlp sees SIGPIPE if ffmpeg exits early
+        downloader.stdout.close()
+
+        try:
+            encoder.wait(timeout=config.AUDIO_PIPELINE_TIMEOUT_SECONDS)
+            downloader.wait(timeout=config.AUDIO_METADATA_TIMEOUT_SECONDS)
+        except subprocess.TimeoutExpired:
+            downloader.kill()
+            encoder.kill()
+            downloader.wait()
+            encoder.wait()
+            print(f"Audio pipeline timed out for {url}")
+            return None
+
+        if downloader.returncode != 0 or encoder.returncode != 0:
+            log.seek(0)
+            print("Error downloading audio:", log.read().decode("utf-8", errors="replace"))
+            return None
 
+    file_size = os.path.getsize(output_file)
+    print(f"Audio for {video_id}: {file_size} bytes at {bitrate_k}k")
+    if file_size > max_size_bytes:
+        print(f"Warning: audio for {video_id} exceeds {max_size_bytes} bytes even at {bitrate_k}k")
     return output_file
 
 
-def compress_audio(input_file, max_size_bytes=19000000):
-    file_size = os.path.getsize(input_file)
-
-    if file_size <= max_size_bytes:
-        print("File already within size limit.")
-        return input_file
-
-    # Get original duration
-    duration_info = subprocess.run(
-        ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "default=noprint_wrappers=1:nokey=1", input_file],
-        capture_output=True, text=True
+def cut_audio_segment(input_file, output_file, start_seconds, length_seconds):
+    """
+    Copies one time window of an mp3 into its own file without re-encoding.
+    Returns output_file, or None on failure. Blocking; run it in the audio pool.
+    """
+    process = subprocess.run(
+        ["ffmpeg", "-y", "-loglevel", "error", "-ss", str(start_seconds), "-t", str(length_seconds),
+         "-i", input_file, "-c", "copy", output_file],
+        capture_output=True, text=True, timeout=config.AUDIO_METADATA_TIMEOUT_SECONDS
     )
-
-    duration = float(duration_info.stdout.strip())
-
-    target_size_bits = max_size_bytes * 8
-    optimal_bitrate = int((target_size_bits / duration) * 0.95)
-
-    # Convert to kilobits per second for ffmpeg
-    optimal_bitrate_k = str(optimal_bitrate // 1000) + "k"
-
-    compressed_file = "compressed_audio.mp3"
-    command = [
-        "ffmpeg",
-        "-y",  # Overwrite output file if it exists
-        "-i", input_file,
-        "-b:a", optimal_bitrate_k,
-        compressed_file
-    ]
-
-    subprocess.run(command, capture_output=True)
-
-    compressed_size = os.path.getsize(compressed_file)
-    print(f"Compressed file size: {compressed_size} bytes")
-
-    # If still too large (due to encoder overhead or minimum bitrate constraints)
-    if compressed_size > max_size_bytes:
-        # Try again with an adjusted bitrate
-        adjusted_factor = max_size_bytes / compressed_size * 0.95
-        adjusted_bitrate = int(optimal_bitrate * adjusted_factor)
-        adjusted_bitrate_k = str(adjusted_bitrate // 1000) + "k"
-
-        adjusted_command = [
-            "ffmpeg",
-            "-y",
-            "-i", input_file,
-            "-b:a", adjusted_bitrate_k,
-            compressed_file
-        ]
-
-        subprocess.run(adjusted_command, capture_output=True)
-
-    return compressed_file
+    if process.returncode != 0 or not os.path.exists(output_file):
+        print("Error cutting audio segment:", process.stderr)
+        return None
+    return output_file
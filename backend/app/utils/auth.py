@@ -3,6 +3,7 @@ from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from pydantic import BaseModel
 from datetime import datetime, timezone
+from cachetools import TTLCache
 from app.db.mongodb import get_database
 from app.config import config
 
@@ -15,37 +16,95 @@ class User(BaseModel):
     email: str
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme)):
-    """
-    Reusable dependency to validate and decode a JWT token, then return the user from the DB.
-    Raises HTTP 401 if token is invalid or user is not found.
-    """
-    credentials_exception = HTTPException(
+# user_id -> User. Short TTL bounds how long a changed or deleted user keeps resolving
+# on workers that did not see the change.
+_principal_cache = TTLCache(maxsize=config.PRINCIPAL_CACHE_SIZE, ttl=config.PRINCIPAL_CACHE_TTL_SECONDS)
+_stats = {"hits": 0, "misses": 0, "claims": 0}
+
+
+def _credentials_exception():
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def decode_access_token(token: str) -> dict:
+    """Verifies the signature and expiry of a JWT and returns its payload. Raises HTTP 401 otherwise."""
     try:
         payload = jwt.decode(token, config.SECRET_KEY, algorithms=[config.ALGORITHM])
-        email: str = payload.get("email")
-        user_id: str = payload.get("user_id")
-        exp_iso_string = payload.get("expiry")
+    except JWTError:
+        raise _credentials_exception()
 
-        if email is None or user_id is None or exp_iso_string is None:
-            raise credentials_exception
-        # Check token expiration
+    exp_iso_string = payload.get("expiry")
+    if payload.get("email") is None or payload.get("user_id") is None or exp_iso_string is None:
+        raise _credentials_exception()
+    # Check token expiration
+    try:
         exp_datetime = datetime.fromisoformat(exp_iso_string)
-        if datetime.now(tz=timezone.utc) > exp_datetime:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
+    except (TypeError, ValueError):
+        raise _credentials_exception()
+    if datetime.now(tz=timezone.utc) > exp_datetime:
+        raise _credentials_exception()
+    return payload
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme)):
+    """
+    Reusable dependency to validate and decode a JWT token, then return the user from the DB.
+    Users are cached by user_id for PRINCIPAL_CACHE_TTL_SECONDS.
+    Raises HTTP 401 if token is invalid or user is not found.
+    """
+    payload = decode_access_token(token)
+    user_id: str = payload["user_id"]
 
+    user = _principal_cache.get(user_id)
+    if user is not None:
+        _stats["hits"] += 1
+        return user
+
+    _stats["misses"] += 1
     db = get_database()
-    user_doc = await db.users.find_one({"user_id": user_id})
+    user_doc = await db.users.find_one({"user_id": user_id}, {"_id": 0, "user_id": 1, "username": 1, "email": 1})
     if not user_doc:
-        raise credentials_exception
+        raise _credentials_exception()
 
-    return User(
+    user = User(
         user_id=str(user_doc["user_id"]),
         username=user_doc["username"],
         email=user_doc["email"])
+    _principal_cache[user_id] = user
+    return user
+
+
+async def get_current_user_from_claims(token: str = Depends(oauth2_scheme)):
+    """
+    Dependency for read-only routes. With AUTH_TRUST_TOKEN_CLAIMS enabled the user is built
+    from the signed token alone, without confirming it still exists; otherwise (or for tokens
+    issued without a username claim) it behaves like get_current_user.
+    """
+    if not config.AUTH_TRUST_TOKEN_CLAIMS:
+        return await get_current_user(token)
+
+    payload = decode_access_token(token)
+    if payload.get("username") is None:
+        return await get_current_user(token)
+
+    _stats["claims"] += 1
+    return User(user_id=payload["user_id"], username=payload["username"], email=payload["email"])
+
+
+def invalidate_principal(user_id: str):
+    """Drops a user from this worker's principal cache. Call whenever a user record changes."""
+    _principal_cache.pop(user_id, None)
+
+
+def get_principal_cache_stats() -> dict:
+    lookups = _stats["hits"] + _stats["misses"]
+    return {
+        **_stats,
+        "size": len(_principal_cache),
+        "hit_ratio": round(_stats["hits"] / lookups, 4) if lookups else 0.0,
+        "trust_token_claims": config.AUTH_TRUST_TOKEN_CLAIMS,
+    }
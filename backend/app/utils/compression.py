@@ -0,0 +1,139 @@
+import gzip
+import zlib
+from starlette.datastructures import Headers, MutableHeaders
+from app.config import config
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Already compressed, or must reach the client chunk by chunk
+_SKIP_CONTENT_TYPES = ("text/event-stream", "image/", "audio/", "video/", "application/zip")
+
+
+def _accepted_encodings(accept_encoding: str) -> dict:
+    """Parses an Accept-Encoding header into {encoding: q}."""
+    encodings = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        encodings[name.strip()] = q
+    return encodings
+
+
+def choose_encoding(accept_encoding: str):
+    """Picks zstd over gzip when the client accepts both; None when neither is acceptable."""
+    encodings = _accepted_encodings(accept_encoding)
+    candidates = ["zstd", "gzip"] if zstandard is not None else ["gzip"]
+    for encoding in candidates:
+        if encodings.get(encoding, encodings.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+class _Compressor:
+    def __init__(self, encoding: str):
+        if encoding == "zstd":
+            self._obj = zstandard.ZstdCompressor(level=config.ZSTD_COMPRESSION_LEVEL).compressobj()
+        else:
+            # wbits 16+ writes a gzip header and trailer
+            self._obj = zlib.compressobj(config.GZIP_COMPRESSION_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+    @staticmethod
+    def compress_once(encoding: str, data: bytes) -> bytes:
+        if encoding == "zstd":
+            return zstandard.ZstdCompressor(level=config.ZSTD_COMPRESSION_LEVEL).compress(data)
+        return gzip.compress(data, compresslevel=config.GZIP_COMPRESSION_LEVEL)
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses with zstd or gzip, negotiated from Accept-Encoding.
+    Single-chunk bodies smaller than minimum_size are sent as-is; streamed bodies
+    are compressed chunk by chunk, except event streams which must not be buffered.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, compressor, passthrough
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                if "content-encoding" in headers or content_type.startswith(_SKIP_CONTENT_TYPES):
+                    passthrough = True
+                    await send(message)
+                else:
+                    # Held back until the first body chunk shows whether compression pays off
+                    start_message = message
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start_message is not None:
+                headers = MutableHeaders(raw=start_message["headers"])
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    start_message = None
+                    return
+
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if not more_body:
+                    body = _Compressor.compress_once(encoding, body)
+                    headers["Content-Length"] = str(len(body))
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body})
+                    start_message = None
+                    return
+
+                del headers["Content-Length"]
+                compressor = _Compressor(encoding)
+                await send(start_message)
+                start_message = None
+
+            chunk = compressor.compress(body)
+            if not more_body:
+                chunk += compressor.flush()
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
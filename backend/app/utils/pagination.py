@@ -0,0 +1,66 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException, status
+from pymongo import DESCENDING
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(sort_value: datetime, last_id: ObjectId) -> str:
+    """Opaque cursor pointing just after the given (sort value, _id) pair."""
+    payload = json.dumps({"t": sort_value.isoformat(), "id": str(last_id)})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(payload["t"]), ObjectId(payload["id"])
+    except (ValueError, KeyError, TypeError, InvalidId):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
+
+
+async def paginate(collection, query: dict, projection: dict, sort_field: str,
+                   limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None, fetch_all: bool = False):
+    """
+    Keyset pagination, newest first, on (sort_field, _id).
+    Returns (documents, next_cursor); next_cursor is None on the last page.
+    fetch_all=True returns every matching document in one unbounded read.
+    Documents without sort_field (legacy rows) cannot be placed by a cursor, so paged
+    reads skip them; fetch_all still returns them.
+    """
+    sort = [(sort_field, DESCENDING), ("_id", DESCENDING)]
+
+    if fetch_all:
+        documents = await collection.find(query, {**projection, "_id": 0}).sort(sort).to_list(length=None)
+        return documents, None
+
+    query = {"$and": [query, {sort_field: {"$exists": True, "$ne": None}}]}
+    if cursor:
+        sort_value, last_id = decode_cursor(cursor)
+        query = {"$and": [query, {"$or": [
+            {sort_field: {"$lt": sort_value}},
+            {sort_field: sort_value, "_id": {"$lt": last_id}},
+        ]}]}
+
+    # Fetch one extra document to learn whether another page exists. The cursor needs the
+    # sort value and _id even when the caller's projection leaves them out.
+    documents = await collection.find(query, {**projection, sort_field: 1, "_id": 1}) \
+        .sort(sort).limit(limit + 1).to_list(length=limit + 1)
+
+    next_cursor = None
+    if len(documents) > limit:
+        documents = documents[:limit]
+        last = documents[-1]
+        next_cursor = encode_cursor(last[sort_field], last["_id"])
+
+    for document in documents:
+        document.pop("_id", None)
+        if not projection.get(sort_field):
+            document.pop(sort_field, None)
+    return documents, next_cursor
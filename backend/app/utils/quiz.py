@@ -1,11 +1,13 @@
-from app.services.youtube import get_video_id, download_youtube_audio, get_transcript
-from app.services.ai.gemini import generate_quiz_from_text, audio_to_json_gemini
+from app.services.youtube import get_video_id, get_transcript
+from app.services.gemini_files import get_gemini_audio_refs, invalidate_file
+from app.config import config
+from app.services.ai.gemini import generate_quiz_from_text, audio_to_json_gemini, is_missing_file_error
 from app.services.ai.groq import generate_quiz_from_text_groq
 from app.services.article_extraction import get_article_transcript
-from app.models.ai_models import Services, SourceTypes, SOURCE_TO_MODEL_MAPPING
+from app.models.ai_models import Services, SourceTypes, SOURCE_TO_MODEL_MAPPING, ModelPairs
 from app.models.quiz import AIQuizResponse
+import asyncio
 import json
-import os
 from bson import ObjectId
 import time
 
@@ -114,36 +116,115 @@ def clean_ai_response(text: str) -> str:
     return text
 
 
-def generate_quiz_from_audio(source_url, prompt, question_count):
+def split_question_count(question_count, segment_count):
+    """Spreads question_count over consecutive segments as evenly as possible; shares may be 0."""
+    return [
+        (i + 1) * question_count // segment_count - i * question_count // segment_count
+        for i in range(segment_count)
+    ]
+
+
+def group_segments(segments, group_count):
+    """Splits segments into group_count runs of consecutive segments, as even in size as possible."""
+    sizes = split_question_count(len(segments), group_count)
+    starts = [sum(sizes[:i]) for i in range(group_count)]
+    return [segments[start:start + size] for start, size in zip(starts, sizes)]
+
+
+def audio_quiz_prompt(prompt, difficulty, question_count, part=None, part_count=1) -> str:
+    quiz_prompt = generate_quiz_prompt("the attached audio", prompt, difficulty, question_count)
+    if part_count > 1:
+        quiz_prompt = quiz_prompt.rstrip() + f"\n    - The audio is part {part} of {part_count} of one video; ask only about this part\n"
+    return quiz_prompt
+
+
+async def quiz_from_audio_refs(audio_refs, prompt, difficulty, model_id, question_count):
+    """
+    Runs one model call per run of consecutive audio segments, at most
+    AUDIO_SEGMENT_CONCURRENCY at a time, each asking for its share of question_count.
+    With fewer questions than segments, segments are grouped so every part of the
+    video still reaches the model. Responses keep segment order.
+    """
+    semaphore = asyncio.Semaphore(config.AUDIO_SEGMENT_CONCURRENCY)
+    groups = group_segments(audio_refs, max(1, min(len(audio_refs), question_count)))
+    shares = split_question_count(question_count, len(groups))
+
+    async def quiz_for_group(index, group, share):
+        group_prompt = audio_quiz_prompt(prompt, difficulty, share, index + 1, len(groups))
+        async with semaphore:
+            return await asyncio.to_thread(audio_to_json_gemini, group, group_prompt, model_id, AIQuizResponse)
+
+    return await asyncio.gather(*(
+        quiz_for_group(index, group, share) for index, (group, share) in enumerate(zip(groups, shares))
+    ))
+
+
+def parse_audio_quiz(ai_response) -> dict:
+    """Validates one model response against AIQuizResponse. Raises ValueError when it does not match."""
+    return AIQuizResponse.model_validate_json(clean_ai_response(ai_response.get("text") or "")).model_dump()
+
+
+def merge_segment_quizzes(quizzes) -> dict:
+    """Concatenates the questions of per-segment quizzes in order and renumbers every ID."""
+    merged = {**quizzes[0], "questions": [q for quiz in quizzes for q in quiz.get("questions", [])]}
+    return add_ids_to_quiz(merged)
+
+
+async def generate_quiz_from_audio(source_url, prompt, difficulty, question_count) -> dict:
+    """
+    Generates a quiz by having Gemini listen to the video's audio, for videos without a
+    usable transcript. Returns {"quiz", "source_id", "metadata"} or {"error"}.
+    """
     video_id = get_video_id(source_url)
-    audio_file = download_youtube_audio(source_url)
-    if not audio_file:
+    model_id = ModelPairs.GEMINI_FLASH.model_id
+    audio_refs = await get_gemini_audio_refs(source_url)
+    if not audio_refs:
         return {"error": "Failed to download YouTube audio."}
-    ai_response = audio_to_json_gemini(audio_file, prompt, GEMINI_FLASH_MODEL, question_count)
-    ai_response_text = ai_response.get('text', '')
+
+    try:
+        try:
+            ai_responses = await quiz_from_audio_refs(audio_refs, prompt, difficulty, model_id, question_count)
+        except Exception as e:
+            if not is_missing_file_error(e):
+                raise
+            # A registered upload was deleted before its expiry; upload once more
+            await invalidate_file(video_id)
+            audio_refs = await get_gemini_audio_refs(source_url)
+            if not audio_refs:
+                return {"error": "Failed to download YouTube audio."}
+            ai_responses = await quiz_from_audio_refs(audio_refs, prompt, difficulty, model_id, question_count)
+    except Exception as e:
+        return {"error": f"AI generation failed: {str(e)}"}
+    if not ai_responses or not all(ai_responses):
+        return {"error": "Failed to generate quiz from YouTube audio."}
+
+    try:
+        quiz = merge_segment_quizzes([parse_audio_quiz(response) for response in ai_responses])
+    except ValueError as e:
+        return {"error": f"AI generation failed to produce valid structured data: {str(e)}"}
+
     metadata = {
-        "model": ai_response.get('model', ""),
-        "service": "gemini",
-        "input_tokens": ai_response.get('input_tokens', 0),
-        "output_tokens": ai_response.get('output_tokens', 0),
+        "model": ai_responses[0].get('model', ""),
+        "service": Services.GEMINI,
+        "input_tokens": sum(response.get('input_tokens') or 0 for response in ai_responses),
+        "output_tokens": sum(response.get('output_tokens') or 0 for response in ai_responses),
+        "audio_segments": len(audio_refs),
     }
-    os.remove(audio_file)
-    source_id = video_id
-    return ai_response_text, metadata, source_id
+    return {"quiz": quiz, "source_id": video_id, "metadata": metadata}
 
 
-def get_source_content(quiz_source, source_url):
+async def get_source_content(quiz_source, source_url):
     if quiz_source == SourceTypes.YOUTUBE:
-        return get_transcript(source_url), get_video_id(source_url)
+        return await get_transcript(source_url), get_video_id(source_url)
     elif quiz_source == SourceTypes.ARTICLE:
-        return get_article_transcript(source_url), ""
+        return await get_article_transcript(source_url), ""
     elif quiz_source == SourceTypes.MISTAKES:
         return "", "practice"
     else:
         return "", ""
 
 
-def generate_quiz(quiz_data) -> dict:
+async def generate_quiz(quiz_data) -> dict:
     quiz_source = quiz_data.quiz_source
     quiz_topic = quiz_data.quiz_topic or ""
     prompt = quiz_data.prompt or ""
@@ -161,7 +242,7 @@ def generate_quiz(quiz_data) -> dict:
         return {"error": "Quiz topic mandatory for manual quiz."}
 
     # Get source content and ID
-    content, source_id = get_source_content(quiz_source, source_url)
+    content, source_id = await get_source_content(quiz_source, source_url)
 
     # Get the service-model pair for this source type
     model_pair = SOURCE_TO_MODEL_MAPPING.get(quiz_source, SOURCE_TO_MODEL_MAPPING["default"])
@@ -3,12 +3,16 @@
 import time
 from bson import ObjectId
 
+from app.config import config
 from app.models.quiz import QuizCreate, AIQuizResponse
 from app.models.ai_models import SourceTypes
-from app.services.youtube import get_video_id, get_transcript
+from app.services.youtube import get_video_id, TranscriptUnavailableError
+from app.services.transcript_cache import get_cached_transcript
+from app.services.single_flight import single_flight, get_source_key
 from app.services.article_extraction import get_article_transcript
-from app.services.generate_ai_response import generate_response
+from app.services.generate_ai_response import agenerate_response
 from app.services.mistakes_transcript import get_mistake_context_transcript
+from app.utils.quiz import generate_quiz_from_audio
 
 
 def add_ids_to_quiz(quiz: dict) -> dict:
@@ -39,14 +43,20 @@ def add_ids_to_quiz(quiz: dict) -> dict:
     return quiz
 
 
-def get_source_content(quiz_source, source_url):
+async def get_source_content(quiz_source, source_url):
     if quiz_source == SourceTypes.YOUTUBE:
-        transcript = get_transcript(source_url)
+        transcript = await single_flight(
+            get_source_key(quiz_source, source_url),
+            lambda: get_cached_transcript(source_url)
+        )
         if not transcript:
             raise ValueError(f"Failed to get transcript for YouTube URL: {source_url}")
         return transcript, get_video_id(source_url)
     elif quiz_source == SourceTypes.ARTICLE:
-        content = get_article_transcript(source_url)
+        content = await single_flight(
+            get_source_key(quiz_source, source_url),
+            lambda: get_article_transcript(source_url)
+        )
         if not content:
             raise ValueError(f"Failed to extract content from article URL: {source_url}")
         return content, source_url
@@ -71,6 +81,19 @@ def determine_task_name(quiz_data: QuizCreate, is_mistake_quiz: bool) -> str:
         return "quiz_medium_general"
 
 
+async def generate_audio_quiz(quiz_data: QuizCreate, source_url: str, start_time: float) -> dict:
+    """Quiz from the video's audio, in the same shape generate_quiz_2 returns."""
+    difficulty = quiz_data.difficulty.value if quiz_data.difficulty else None
+    result = await generate_quiz_from_audio(
+        source_url, quiz_data.prompt or "", difficulty, quiz_data.number_of_questions
+    )
+    if "error" in result:
+        return result
+    result["metadata"]["task_used"] = "quiz_from_audio"
+    result["metadata"]["time_taken"] = round(time.time() - start_time, 2)
+    return {**result, "quiz_source": quiz_data.quiz_source}
+
+
 async def generate_quiz_2(quiz_data: QuizCreate, user_id) -> dict:
     start_time = time.time()
     quiz_source = quiz_data.quiz_source
@@ -86,20 +109,29 @@ async def generate_quiz_2(quiz_data: QuizCreate, user_id) -> dict:
 
     # 2. Prepare Input Text and Source ID
     input_text = ""
+    additional_instructions = ""
     source_id = ""
     try:
         if quiz_source in [SourceTypes.YOUTUBE, SourceTypes.ARTICLE]:
-            content, source_id = get_source_content(quiz_source, source_url)
+            try:
+                content, source_id = await get_source_content(quiz_source, source_url)
+            except TranscriptUnavailableError:
+                # Only a definite "no transcript" answer; Supadata outages stay errors
+                if not config.QUIZ_AUDIO_FALLBACK:
+                    raise
+                print(f"No transcript for {source_url}, generating the quiz from its audio")
+                return await generate_audio_quiz(quiz_data, source_url, start_time)
             input_text = content
+            # Kept out of input_text so fitting the prompt to the token budget never shortens them
             if quiz_data.prompt:
-                input_text += f"\n\nAdditional Instructions:\n{quiz_data.prompt}"
+                additional_instructions = f"Additional Instructions:\n{quiz_data.prompt}"
 
         elif quiz_source == SourceTypes.MANUAL:
             if not quiz_data.quiz_topic:
                 return {"error": "Quiz topic is mandatory for manual quiz."}
             input_text = f"Topic: {quiz_data.quiz_topic}"
             if quiz_data.prompt:
-                input_text += f"\n\nSpecific Instructions:\n{quiz_data.prompt}"
+                additional_instructions = f"Specific Instructions:\n{quiz_data.prompt}"
 
         elif quiz_source == SourceTypes.MISTAKES:
             print("mistakes in source types. ")
@@ -121,13 +153,15 @@ async def generate_quiz_2(quiz_data: QuizCreate, user_id) -> dict:
         # Common kwargs are 'input_text' and 'num_questions' based on your config
         kwargs_for_llm = {
             "input_text": input_text,
-            "num_questions": quiz_data.number_of_questions
+            "num_questions": quiz_data.number_of_questions,
+            "additional_instructions": additional_instructions,
             # Add other kwargs here if your tasks/prompts require them
         }
         # Filter out None values, though generate_response might handle them
         kwargs_for_llm = {k: v for k, v in kwargs_for_llm.items() if v is not None}
 
-        ai_quiz_response_obj = generate_response(task=task_name, **kwargs_for_llm)
+        prompt_stats = {}
+        ai_quiz_response_obj = await agenerate_response(task=task_name, prompt_stats=prompt_stats, **kwargs_for_llm)
 
         # Check if the response is the expected Pydantic object
         if not isinstance(ai_quiz_response_obj, AIQuizResponse):
@@ -162,6 +196,8 @@ async def generate_quiz_2(quiz_data: QuizCreate, user_id) -> dict:
         "task_used": task_name,
         # "model_config_name": TASK_CONFIGURATIONS[task_name]["model_config_name"], # Requires access to TASK_CONFIGURATIONS
         "time_taken": round(end_time - start_time, 2),
+        "estimated_input_tokens": prompt_stats.get("estimated_input_tokens"),
+        "input_compressed": prompt_stats.get("input_compressed", False),
         # Add other relevant info if available
     }
 
@@ -0,0 +1,21 @@
+from typing import Any
+import orjson
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+
+
+def _orjson_default(obj):
+    # orjson handles datetime, UUID and dataclasses itself; only BSON types need help
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson, serializing datetime and ObjectId natively.
+    Returning one directly from a route also skips FastAPI's jsonable_encoder pass.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
@@ -1,8 +1,14 @@
+import asyncio
 import time
 from bson import ObjectId
-from app.services.youtube import get_video_id, get_transcript
+from app.config import config
+from app.services.youtube import get_video_id
+from app.services.transcript_cache import get_cached_transcript
+from app.services.single_flight import single_flight, get_source_key
 from app.services.article_extraction import get_article_transcript
-from app.services.generate_ai_response import generate_response
+from app.services.generate_ai_response import agenerate_response, astream_response, parse_partial_output
+from app.services.task_registry import get_compiled_task
+from app.services.token_budget import count_tokens
 from app.models.common_schemas import SourceTypes
 
 
@@ -24,15 +30,21 @@ def determine_summary_task(summary_source, length):
             return "summary_medium"
 
 
-def get_source_content(summary_source, source_url):
+async def get_source_content(summary_source, source_url):
     """Get content to be summarized from the appropriate source"""
     if summary_source == SourceTypes.YOUTUBE:
-        transcript = get_transcript(source_url)
+        transcript = await single_flight(
+            get_source_key(summary_source, source_url),
+            lambda: get_cached_transcript(source_url)
+        )
         if not transcript:
             raise ValueError(f"Failed to get transcript for YouTube URL: {source_url}")
         return transcript, get_video_id(source_url)
     elif summary_source == SourceTypes.ARTICLE:
-        content = get_article_transcript(source_url)
+        content = await single_flight(
+            get_source_key(summary_source, source_url),
+            lambda: get_article_transcript(source_url)
+        )
         if not content:
             raise ValueError(f"Failed to extract content from article URL: {source_url}")
         return content, source_url
@@ -40,112 +52,199 @@ def get_source_content(summary_source, source_url):
         return "", ""
 
 
-def generate_summary_from_content(source_type, content, prompt="", length="medium", source_url="", source_id=""):
+async def count_content_tokens(content) -> int:
+    # Tokenizing a long document is CPU-bound, keep it off the event loop
+    return await asyncio.to_thread(count_tokens, content)
+
+
+def needs_chunking(content_tokens, task_name, **prompt_params) -> bool:
+    """
+    True when content of content_tokens tokens does not fit the task's input token budget
+    in one call. Map-reduce keeps every part of such content, where fit_prompt would sample it down.
+    """
+    budget = get_compiled_task(task_name).input_text_budget(**prompt_params)
+    return budget is not None and content_tokens > budget
+
+
+def split_content(content):
+    """Split long content into overlapping chunks, preferring paragraph and sentence boundaries"""
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=config.SUMMARY_CHUNK_SIZE_CHARS,
+        chunk_overlap=config.SUMMARY_CHUNK_OVERLAP_CHARS,
+    )
+    return splitter.split_text(content)
+
+
+async def summarize_chunks(chunks, additional_instructions=""):
+    """
+    Map step: take notes on every chunk concurrently, at most SUMMARY_MAP_CONCURRENCY
+    calls at a time. Returns (notes in chunk order, total estimated input tokens).
+    """
+    semaphore = asyncio.Semaphore(config.SUMMARY_MAP_CONCURRENCY)
+    chunk_stats = [{} for _ in chunks]
+
+    async def summarize_chunk(index, chunk):
+        async with semaphore:
+            notes = await agenerate_response(
+                task="summary_chunk_map",
+                prompt_stats=chunk_stats[index],
+                input_text=chunk,
+                chunk_index=index + 1,
+                chunk_count=len(chunks),
+                additional_instructions=additional_instructions
+            )
+        if not isinstance(notes, str) or not notes.strip():
+            raise ValueError(f"Empty notes for chunk {index + 1} of {len(chunks)}")
+        return notes.strip()
+
+    notes = await asyncio.gather(*(summarize_chunk(i, chunk) for i, chunk in enumerate(chunks)))
+    return notes, sum(stats.get("estimated_input_tokens", 0) for stats in chunk_stats)
+
+
+async def condense_content(content, additional_instructions=""):
+    """
+    Reduce long content to notes that fit in one summary call. Notes that are still
+    too long are chunked and condensed again, up to SUMMARY_MAX_REDUCE_ROUNDS.
+    Returns (notes_text, chunk_count, input_tokens) where chunk_count is the first
+    round's chunk count and input_tokens is the estimate summed over every call.
+    """
+    chunk_count = 0
+    input_tokens = 0
+    for _ in range(config.SUMMARY_MAX_REDUCE_ROUNDS):
+        chunks = split_content(content)
+        chunk_count = chunk_count or len(chunks)
+        notes, tokens = await summarize_chunks(chunks, additional_instructions)
+        input_tokens += tokens
+        content = "\n\n".join(f"## Part {i + 1}\n{note}" for i, note in enumerate(notes))
+        content_tokens = await count_content_tokens(content)
+        if not needs_chunking(content_tokens, "summary_chunk_reduce", additional_instructions=additional_instructions):
+            break
+    return content, chunk_count, input_tokens
+
+
+def reduce_task_params(task_name):
+    """The chunked reduce step keeps the length the direct task would have used"""
+    length = get_compiled_task(task_name).default_params.get("length")
+    return {"length": length} if length else {}
+
+
+def build_summary_result(summary_response, source_type, task_name, content, start_time, source_url="",
+                         source_id="", chunk_count=0, prompt_stats=None):
+    """Attach metadata and source identifiers to a parsed summary response"""
+    end_time = time.time()
+
+    # Create metadata
+    metadata = {
+        "time_taken": round(end_time - start_time, 2),
+        "task_used": task_name,
+    }
+    if prompt_stats:
+        metadata["estimated_input_tokens"] = prompt_stats.get("estimated_input_tokens")
+        metadata["input_compressed"] = prompt_stats.get("input_compressed", False)
+    if chunk_count:
+        metadata["chunk_count"] = chunk_count
+
+    # Add source-specific metadata
+    if source_type == SourceTypes.YOUTUBE:
+        metadata.update({
+            "video_id": source_id,
+            "transcript_length": len(content)
+        })
+    elif source_type == SourceTypes.ARTICLE:
+        metadata.update({
+            "article_url": source_url,
+            "article_length": len(content)
+        })
+
+    # Set source type
+    summary_response.source_type = source_type
+
+    result = {
+        "summary_response": summary_response,
+        "source_type": source_type,
+        "metadata": metadata
+    }
+
+    # Add source identifiers based on source type
+    if source_type == SourceTypes.YOUTUBE:
+        result["source_id"] = source_id
+    elif source_type == SourceTypes.ARTICLE:
+        result["source_url"] = source_url
+
+    return result
+
+
+async def generate_summary_from_content(source_type, content, prompt="", length="medium", source_url="", source_id=""):
     """Generate summary from content regardless of source type"""
     start_time = time.time()
     
     task_name = determine_summary_task(source_type, length)
     additional_instructions = prompt if prompt else ""
     
+    prompt_stats = {}
     try:
-        summary_response = generate_response(
+        content_tokens = await count_content_tokens(content)
+        if needs_chunking(content_tokens, task_name, additional_instructions=additional_instructions):
+            # Map-reduce: notes per chunk in parallel, then one summary of the notes
+            notes, chunk_count, map_tokens = await condense_content(content, additional_instructions)
+            summary_response = await agenerate_response(
+                task="summary_chunk_reduce",
+                prompt_stats=prompt_stats,
+                input_text=notes,
+                additional_instructions=additional_instructions,
+                **reduce_task_params(task_name)
+            )
+            prompt_stats["estimated_input_tokens"] += map_tokens
+            return build_summary_result(
+                summary_response, source_type, "summary_chunk_reduce", content, start_time,
+                source_url, source_id, chunk_count, prompt_stats
+            )
+
+        summary_response = await agenerate_response(
             task=task_name,
+            prompt_stats=prompt_stats,
             input_text=content,
+            input_tokens=content_tokens,
             additional_instructions=additional_instructions
         )
-        
-        end_time = time.time()
-        
-        # Create metadata
-        metadata = {
-            "time_taken": round(end_time - start_time, 2),
-            "task_used": task_name,
-        }
-        
-        # Add source-specific metadata
-        if source_type == SourceTypes.YOUTUBE:
-            metadata.update({
-                "video_id": source_id,
-                "transcript_length": len(content)
-            })
-        elif source_type == SourceTypes.ARTICLE:
-            metadata.update({
-                "article_url": source_url,
-                "article_length": len(content)
-            })
-        
-        # Set source type
-        if isinstance(summary_response, dict):
-            summary_response.source_type = source_type
-        else:
-            summary_response.source_type = source_type
-            
-        result = {
-            "summary_response": summary_response,
-            "source_type": source_type,
-            "metadata": metadata
-        }
-        
-        # Add source identifiers based on source type
-        if source_type == SourceTypes.YOUTUBE:
-            result["source_id"] = source_id
-        elif source_type == SourceTypes.ARTICLE:
-            result["source_url"] = source_url
-            
-        return result
-        
+        return build_summary_result(
+            summary_response, source_type, task_name, content, start_time, source_url, source_id,
+            prompt_stats=prompt_stats
+        )
+
     except Exception as e:
         return {"error": f"Failed to generate summary: {str(e)}"}
 
 
-def generate_summary(summary_data):
+async def resolve_summary_content(summary_data):
+    """
+    Returns (source_type, content, source_url, source_id) for a summary request.
+    Raises ValueError when the request has no usable content.
+    """
     summary_source = summary_data.summarySource
-    prompt = summary_data.prompt or ""
     source_url = summary_data.contentSource.url if summary_data.contentSource else ""
     text_content = summary_data.textContent if hasattr(summary_data, "textContent") else ""
-    length = summary_data.length if hasattr(summary_data, "length") else "medium"
 
-    try:
-        if summary_source in [SourceTypes.YOUTUBE, SourceTypes.ARTICLE]:
-            if not source_url:
-                return {"error": f"{summary_source.capitalize()} URL is required."}
-            
-            content, source_id = get_source_content(summary_source, source_url)
-            result = generate_summary_from_content(
-                source_type=summary_source,
-                content=content,
-                prompt=prompt,
-                length=length,
-                source_url=source_url,
-                source_id=source_id
-            )
-        elif summary_source == SourceTypes.TEXT:
-            if not text_content:
-                return {"error": "Text content is required for summarization."}
-            
-            result = generate_summary_from_content(
-                source_type=SourceTypes.MANUAL,
-                content=text_content,
-                prompt=prompt,
-                length=length
-            )
-        else:
-            return {"error": f"Invalid summary source provided: {summary_source}"}
-    
-    except ValueError as e:
-        return {"error": str(e)}
-    except Exception as e:
-        return {"error": f"Error generating summary: {str(e)}"}
+    if summary_source in [SourceTypes.YOUTUBE, SourceTypes.ARTICLE]:
+        if not source_url:
+            raise ValueError(f"{summary_source.capitalize()} URL is required.")
+        content, source_id = await get_source_content(summary_source, source_url)
+        return summary_source, content, source_url, source_id
+    elif summary_source == SourceTypes.TEXT:
+        if not text_content:
+            raise ValueError("Text content is required for summarization.")
+        return SourceTypes.MANUAL, text_content, "", ""
+    else:
+        raise ValueError(f"Invalid summary source provided: {summary_source}")
 
-    # Check for errors in result
-    if "error" in result:
-        return result
 
-    # Process the LLM response
+def build_summary_doc(result, source_url=""):
+    """Create the final summary document from a generation result"""
     summary_response = result.get("summary_response")
 
-    # Create the final result document
-    summary_doc = {
+    return {
         "summary_id": str(ObjectId()),
         "title": getattr(summary_response, "title", "Untitled Summary"),
         "summary_text": getattr(summary_response, "summary_text", ""),
@@ -156,4 +255,111 @@ def generate_summary(summary_data):
         "metadata": result.get("metadata", {}),
     }
 
-    return summary_doc
+
+async def generate_summary(summary_data):
+    prompt = summary_data.prompt or ""
+    length = summary_data.length if hasattr(summary_data, "length") else "medium"
+
+    try:
+        source_type, content, source_url, source_id = await resolve_summary_content(summary_data)
+        result = await generate_summary_from_content(
+            source_type=source_type,
+            content=content,
+            prompt=prompt,
+            length=length,
+            source_url=source_url,
+            source_id=source_id
+        )
+    except ValueError as e:
+        return {"error": str(e)}
+    except Exception as e:
+        return {"error": f"Error generating summary: {str(e)}"}
+
+    # Check for errors in result
+    if "error" in result:
+        return result
+
+    return build_summary_doc(result, source_url)
+
+
+async def stream_summary(summary_data):
+    """
+    Generate a summary while streaming it. Yields ("status", stage) and
+    ("partial", summary_text) events, then ends with ("done", summary_doc)
+    or ("error", message).
+    """
+    prompt = summary_data.prompt or ""
+    length = summary_data.length if hasattr(summary_data, "length") else "medium"
+
+    yield ("status", "fetching_source")
+    try:
+        source_type, content, source_url, source_id = await resolve_summary_content(summary_data)
+    except ValueError as e:
+        yield ("error", str(e))
+        return
+    except Exception as e:
+        yield ("error", f"Error generating summary: {str(e)}")
+        return
+
+    start_time = time.time()
+    task_name = determine_summary_task(source_type, length)
+    chunk_count = 0
+    map_tokens = 0
+
+    try:
+        content_tokens = await count_content_tokens(content)
+        chunking = needs_chunking(content_tokens, task_name, additional_instructions=prompt)
+    except Exception as e:
+        yield ("error", f"Failed to generate summary: {str(e)}")
+        return
+    task_params = {"input_text": content, "input_tokens": content_tokens}
+
+    if chunking:
+        yield ("status", "summarizing_chunks")
+        try:
+            notes, chunk_count, map_tokens = await condense_content(content, prompt)
+        except Exception as e:
+            yield ("error", f"Failed to generate summary: {str(e)}")
+            return
+        task_name = "summary_chunk_reduce"
+        task_params = {"input_text": notes, **reduce_task_params(determine_summary_task(source_type, length))}
+
+    yield ("status", "generating")
+    raw_content = ""
+    parsed_length = 0
+    last_summary_text = ""
+    summary_response = None
+    prompt_stats = {}
+
+    try:
+        async for event in astream_response(
+            task=task_name,
+            prompt_stats=prompt_stats,
+            additional_instructions=prompt,
+            **task_params
+        ):
+            if "result" in event:
+                summary_response = event["result"]
+                continue
+
+            raw_content += event["delta"]
+            # Each parse reads the whole buffer, so parsing every delta would be quadratic
+            if len(raw_content) - parsed_length < config.SUMMARY_STREAM_PARSE_CHARS:
+                continue
+            parsed_length = len(raw_content)
+            partial = parse_partial_output(raw_content)
+            summary_text = partial.get("summary_text") if partial else None
+            if isinstance(summary_text, str) and summary_text != last_summary_text:
+                last_summary_text = summary_text
+                yield ("partial", summary_text)
+
+        prompt_stats["estimated_input_tokens"] = prompt_stats.get("estimated_input_tokens", 0) + map_tokens
+        result = build_summary_result(
+            summary_response, source_type, task_name, content, start_time, source_url, source_id,
+            chunk_count, prompt_stats
+        )
+    except Exception as e:
+        yield ("error", f"Failed to generate summary: {str(e)}")
+        return
+
+    yield ("done", build_summary_doc(result, source_url))
@@ -0,0 +1,16 @@
+import os
+
+# app.config requires these at import; the unit tests never reach the services they configure
+for name, value in {
+    "MONGO_URI": "mongodb://localhost:27017",
+    "SECRET_KEY": "test-secret",
+    "ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+    "REFRESH_TOKEN_EXPIRE_DAYS": "7",
+    "GOOGLE_GEMINI_KEY": "test",
+    "GROQ_API_KEY": "test",
+    "OPEN_ROUTER_KEY": "test",
+    "RAPID_API_KEY": "test",
+    "SUPADATA_API_KEY": "test",
+}.items():
+    os.environ.setdefault(name, value)
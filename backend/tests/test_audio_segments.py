@@ -0,0 +1,101 @@
+import json
+import pytest
+from app.services.audio_pipeline import segment_windows
+from app.utils import quiz as quiz_utils
+from app.utils.quiz import split_question_count, group_segments, merge_segment_quizzes, parse_audio_quiz
+
+
+def make_quiz(title, question_count):
+    return {
+        "quiz_title": title,
+        "difficulty": "easy",
+        "category": "Science",
+        "questions": [
+            {
+                "question_id": f"{title}-{i}",
+                "question_text": f"{title} question {i}",
+                "correct_choice_id": "b",
+                "answer_explanation": "Because.",
+                "choices": [
+                    {"choice_id": "a", "choice_text": "A", "choice_explanation": "Wrong."},
+                    {"choice_id": "b", "choice_text": "B", "choice_explanation": "Right."},
+                ],
+            }
+            for i in range(question_count)
+        ],
+    }
+
+
+@pytest.mark.parametrize("duration, segment_seconds, count", [(300, 600, 1), (600, 600, 1), (601, 600, 2), (3600, 600, 6)])
+def test_segment_windows_count(duration, segment_seconds, count):
+    assert len(segment_windows(duration, segment_seconds)) == count
+
+
+def test_segment_windows_cover_the_whole_duration_without_gaps():
+    windows = segment_windows(3700, 600)
+
+    assert windows[0][0] == 0
+    for (start, length), (next_start, _) in zip(windows, windows[1:]):
+        assert start + length == pytest.approx(next_start, abs=0.01)
+        assert length <= 600
+    last_start, last_length = windows[-1]
+    assert last_start + last_length >= 3700
+
+
+@pytest.mark.parametrize("question_count, segment_count", [(10, 3), (5, 5), (2, 4), (7, 1)])
+def test_split_question_count_sums_to_total_and_is_even(question_count, segment_count):
+    shares = split_question_count(question_count, segment_count)
+
+    assert len(shares) == segment_count
+    assert sum(shares) == question_count
+    assert max(shares) - min(shares) <= 1
+
+
+@pytest.mark.parametrize("segment_count, group_count", [(7, 3), (4, 4), (5, 1), (6, 2)])
+def test_group_segments_keeps_every_segment_in_order(segment_count, group_count):
+    segments = list(range(segment_count))
+
+    groups = group_segments(segments, group_count)
+
+    assert len(groups) == group_count
+    assert all(groups)
+    assert [s for group in groups for s in group] == segments
+
+
+def test_merge_segment_quizzes_concatenates_in_order_and_renumbers():
+    merged = merge_segment_quizzes([make_quiz("first", 2), make_quiz("second", 1)])
+
+    assert merged["quiz_title"] == "first"
+    assert [q["question_text"] for q in merged["questions"]] == [
+        "first question 0", "first question 1", "second question 0"
+    ]
+    question_ids = [q["question_id"] for q in merged["questions"]]
+    assert question_ids == [f"{merged['quiz_id']}-{i}" for i in (1, 2, 3)]
+    for question in merged["questions"]:
+        assert question["correct_choice_id"] == f"{question['question_id']}-2"
+
+
+def test_parse_audio_quiz_accepts_fenced_json_and_rejects_bad_shapes():
+    text = "```json\n" + json.dumps(make_quiz("fenced", 1)) + "\n```"
+
+    assert parse_audio_quiz({"text": text})["quiz_title"] == "fenced"
+    with pytest.raises(ValueError):
+        parse_audio_quiz({"text": json.dumps({"quiz_title": "missing fields"})})
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("question_count, segment_count, call_count", [(2, 5, 2), (6, 3, 3), (1, 4, 1)])
+async def test_quiz_from_audio_refs_sends_every_segment(monkeypatch, question_count, segment_count, call_count):
+    calls = []
+
+    def fake_audio_to_json(audio_refs, prompt, model, response_schema=None):
+        calls.append([ref["uri"] for ref in audio_refs])
+        return {"text": "{}"}
+
+    monkeypatch.setattr(quiz_utils, "audio_to_json_gemini", fake_audio_to_json)
+    audio_refs = [{"uri": f"files/{i}", "mime_type": "audio/mpeg"} for i in range(segment_count)]
+
+    responses = await quiz_utils.quiz_from_audio_refs(audio_refs, "", "easy", "model", question_count)
+
+    assert len(responses) == call_count
+    assert sorted(uri for call in calls for uri in call) == sorted(ref["uri"] for ref in audio_refs)
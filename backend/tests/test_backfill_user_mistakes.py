@@ -0,0 +1,72 @@
+from datetime import datetime
+import pytest
+from app.db import backfill_user_mistakes
+from app.services import mistakes_transcript
+from app.db.backfill_user_mistakes import backfill_user_mistakes as run_backfill
+from app.services.mistakes_transcript import get_mistake_context_transcript, record_mistakes
+
+QUIZ = {
+    "quiz_id": "q1",
+    "questions": [
+        {
+            "question_id": f"q1-{n}",
+            "question_text": f"Question {n}",
+            "correct_choice_id": f"q1-{n}-1",
+            "answer_explanation": f"Explanation {n}",
+            "choices": [
+                {"choice_id": f"q1-{n}-1", "choice_text": f"Right {n}"},
+                {"choice_id": f"q1-{n}-2", "choice_text": f"Wrong {n}"},
+            ],
+        }
+        for n in (1, 2)
+    ],
+}
+
+
+@pytest.fixture
+def db(monkeypatch):
+    from mongomock_motor import AsyncMongoMockClient
+    database = AsyncMongoMockClient()["learnscribe"]
+    monkeypatch.setattr(backfill_user_mistakes, "get_database", lambda: database)
+    monkeypatch.setattr(mistakes_transcript, "get_database", lambda: database)
+    return database
+
+
+async def insert_legacy_attempt(db):
+    await db.quizzes.insert_one(dict(QUIZ))
+    await db.quiz_attempts.insert_one({
+        "attempt_id": "legacy",
+        "quiz_id": "q1",
+        "user_id": "u1",
+        "attempted_at": datetime(2024, 1, 1),
+        "responses": [
+            {"question_id": "q1-1", "selected_choice_id": "q1-1-2", "is_correct": False},
+            {"question_id": "q1-2", "selected_choice_id": "q1-2-1", "is_correct": True},
+        ],
+    })
+
+
+@pytest.mark.asyncio
+async def test_backfill_materializes_legacy_mistakes_once(db):
+    await insert_legacy_attempt(db)
+
+    assert await run_backfill() == 1
+    assert await run_backfill() == 0
+
+    mistake = await db.user_mistakes.find_one({"attempt_id": "legacy"}, {"_id": 0})
+    assert mistake["question_text"] == "Question 1"
+    assert mistake["selected_choice_text"] == "Wrong 1"
+    assert mistake["correct_choice_text"] == "Right 1"
+
+
+@pytest.mark.asyncio
+async def test_context_keeps_legacy_history_after_a_new_mistake(db):
+    await insert_legacy_attempt(db)
+    await run_backfill()
+    await record_mistakes(
+        "u1", QUIZ, [{"question_id": "q1-2", "selected_choice_id": "q1-2-2"}], "new", datetime(2025, 1, 1)
+    )
+
+    context = await get_mistake_context_transcript("u1")
+
+    assert context.index("Question 2") < context.index("Question 1")
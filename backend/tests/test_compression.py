@@ -0,0 +1,79 @@
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+from app.utils.compression import CompressionMiddleware, choose_encoding
+
+BODY = "learnscribe " * 500
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("gzip, deflate, br, zstd", "zstd"),
+    ("gzip", "gzip"),
+    ("zstd;q=0, gzip", "gzip"),
+    ("gzip;q=0", None),
+    ("*", "zstd"),
+    ("identity", None),
+    ("", None),
+    ("gzip;q=bogus, zstd", "zstd"),
+])
+def test_choose_encoding(accept_encoding, expected):
+    assert choose_encoding(accept_encoding) == expected
+
+
+def make_client():
+    async def large(request):
+        return PlainTextResponse(BODY)
+
+    async def small(request):
+        return PlainTextResponse("ok")
+
+    async def streamed(request):
+        async def chunks():
+            for _ in range(3):
+                yield BODY
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    async def events(request):
+        async def chunks():
+            yield "data: one\n\n"
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    app = Starlette(routes=[
+        Route("/large", large), Route("/small", small), Route("/streamed", streamed), Route("/events", events),
+    ])
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "zstd"])
+def test_large_body_is_compressed_with_the_negotiated_encoding(encoding):
+    response = make_client().get("/large", headers={"Accept-Encoding": encoding})
+
+    assert response.headers["content-encoding"] == encoding
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < len(BODY)
+    assert response.text == BODY
+
+
+def test_small_body_is_sent_uncompressed():
+    response = make_client().get("/small", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert response.text == "ok"
+
+
+def test_streamed_body_is_compressed_chunk_by_chunk():
+    response = make_client().get("/streamed", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.text == BODY * 3
+
+
+def test_event_streams_are_never_compressed():
+    response = make_client().get("/events", headers={"Accept-Encoding": "gzip, zstd"})
+
+    assert "content-encoding" not in response.headers
+    assert response.text == "data: one\n\n"
@@ -0,0 +1,80 @@
+from datetime import datetime
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+from app.utils.pagination import encode_cursor, decode_cursor
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 3, 1, 12, 30, 15, 123000)
+    last_id = ObjectId()
+
+    assert decode_cursor(encode_cursor(created_at, last_id)) == (created_at, last_id)
+
+
+def test_cursor_is_url_safe():
+    cursor = encode_cursor(datetime(2025, 3, 1), ObjectId())
+
+    assert all(c.isalnum() or c in "-_=" for c in cursor)
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "e30=", encode_cursor(datetime(2025, 3, 1), ObjectId())[:-8]])
+def test_invalid_cursor_is_a_bad_request(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor)
+
+    assert exc_info.value.status_code == 400
+
+
+@pytest.fixture
+def quizzes():
+    from mongomock_motor import AsyncMongoMockClient
+    return AsyncMongoMockClient()["learnscribe"]["quizzes"]
+
+
+@pytest.mark.asyncio
+async def test_paginate_walks_every_page_newest_first(quizzes):
+    from app.utils.pagination import paginate
+    # Two documents share a timestamp so the _id tie-break is exercised across a page boundary
+    times = [datetime(2025, 1, day) for day in (1, 2, 3, 3, 4)]
+    await quizzes.insert_many([{"quiz_id": str(i), "created_by": "u", "created_at": t} for i, t in enumerate(times)])
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = await paginate(quizzes, {"created_by": "u"}, {"quiz_id": 1, "_id": 0}, "created_at",
+                                      limit=2, cursor=cursor)
+        seen.extend(doc["quiz_id"] for doc in page)
+        if cursor is None:
+            break
+
+    assert seen == ["4", "3", "2", "1", "0"]
+
+
+@pytest.mark.asyncio
+async def test_paginate_skips_documents_without_the_sort_field(quizzes):
+    from app.utils.pagination import paginate
+    # Missing values sort last, so a legacy document would otherwise end the page and seed the cursor
+    await quizzes.insert_many([
+        {"quiz_id": "a", "created_by": "u", "created_at": datetime(2025, 1, 1)},
+        {"quiz_id": "legacy-1", "created_by": "u"},
+        {"quiz_id": "legacy-2", "created_by": "u"},
+    ])
+
+    page, cursor = await paginate(quizzes, {"created_by": "u"}, {"quiz_id": 1, "_id": 0}, "created_at", limit=2)
+
+    assert page == [{"quiz_id": "a"}]
+    assert cursor is None
+
+
+@pytest.mark.asyncio
+async def test_paginate_fetch_all_keeps_documents_without_the_sort_field(quizzes):
+    from app.utils.pagination import paginate
+    await quizzes.insert_many([
+        {"quiz_id": "a", "created_by": "u", "created_at": datetime(2025, 1, 1)},
+        {"quiz_id": "legacy", "created_by": "u"},
+    ])
+
+    documents, cursor = await paginate(quizzes, {"created_by": "u"}, {"quiz_id": 1}, "created_at", fetch_all=True)
+
+    assert [doc["quiz_id"] for doc in documents] == ["a", "legacy"]
+    assert cursor is None
@@ -0,0 +1,19 @@
+import pytest
+from app.services import password_hashing
+from app.services.password_hashing import get_password_hash, verify_password, shutdown_password_executor
+
+
+@pytest.mark.asyncio
+async def test_hashing_works_again_after_shutdown(monkeypatch):
+    # Keep the test fast; the rounds only affect cost, not behaviour
+    monkeypatch.setattr(password_hashing, "pwd_context", password_hashing.CryptContext(
+        schemes=["bcrypt"], bcrypt__rounds=4
+    ))
+    hashed = await get_password_hash("secret")
+
+    # A second app lifespan in the same process must get a fresh executor
+    shutdown_password_executor()
+
+    assert await verify_password("secret", hashed)
+    assert not await verify_password("wrong", hashed)
+    shutdown_password_executor()
@@ -0,0 +1,64 @@
+import pytest
+from fastapi import HTTPException
+from app.models.quiz import QuizAttemptCreate
+from app.routers import quiz as quiz_router
+from app.services import quiz_cache, mistakes_transcript
+from app.utils.auth import User
+
+QUIZ = {
+    "quiz_id": "q1",
+    "quiz_title": "Cells",
+    "attempt_count": 0,
+    "questions": [
+        {
+            "question_id": "q1-1",
+            "question_text": "Powerhouse of the cell?",
+            "correct_choice_id": "q1-1-2",
+            "answer_explanation": "It produces ATP.",
+            "choices": [
+                {"choice_id": "q1-1-1", "choice_text": "Nucleus", "choice_explanation": "Holds DNA."},
+                {"choice_id": "q1-1-2", "choice_text": "Mitochondria", "choice_explanation": "Makes ATP."},
+            ],
+        },
+    ],
+}
+USER = User(user_id="u1", username="user", email="user@example.com")
+WRONG_ANSWER = QuizAttemptCreate(quiz_id="q1", responses=[{"question_id": "q1-1", "selected_choice_id": "q1-1-1"}])
+
+
+@pytest.fixture
+def db(monkeypatch):
+    from mongomock_motor import AsyncMongoMockClient
+    database = AsyncMongoMockClient()["learnscribe"]
+    for module in (quiz_router, quiz_cache, mistakes_transcript):
+        monkeypatch.setattr(module, "get_database", lambda: database)
+    quiz_cache.invalidate_quiz("q1")
+    yield database
+    quiz_cache.invalidate_quiz("q1")
+
+
+@pytest.mark.asyncio
+async def test_attempt_updates_counters_and_records_mistakes(db):
+    await db.quizzes.insert_one(dict(QUIZ))
+
+    await quiz_router.create_quiz_attempt(WRONG_ANSWER, USER)
+
+    assert (await db.quizzes.find_one({"quiz_id": "q1"}))["attempt_count"] == 1
+    assert await db.quiz_attempts.count_documents({"quiz_id": "q1"}) == 1
+    assert await db.user_mistakes.count_documents({"quiz_id": "q1"}) == 1
+
+
+@pytest.mark.asyncio
+async def test_attempt_on_a_quiz_deleted_behind_the_cache_is_rejected(db):
+    await db.quizzes.insert_one(dict(QUIZ))
+    assert await quiz_cache.get_cached_quiz("q1")
+    # Deleted through another worker, whose invalidation never reaches this cache
+    await db.quizzes.delete_one({"quiz_id": "q1"})
+
+    with pytest.raises(HTTPException) as exc_info:
+        await quiz_router.create_quiz_attempt(WRONG_ANSWER, USER)
+
+    assert exc_info.value.status_code == 404
+    assert await db.quiz_attempts.count_documents({}) == 0
+    assert await db.user_mistakes.count_documents({}) == 0
+    assert await quiz_cache.get_cached_quiz("q1") is None
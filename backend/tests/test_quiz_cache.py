@@ -0,0 +1,59 @@
+from app.services.quiz_cache import _strip_answers, _build_entry
+
+
+def make_quiz():
+    return {
+        "quiz_id": "q1",
+        "quiz_title": "Cells",
+        "metadata": {"task_used": "quiz_easy_general"},
+        "questions": [
+            {
+                "question_id": "q1-1",
+                "question_text": "Powerhouse of the cell?",
+                "correct_choice_id": "q1-1-2",
+                "answer_explanation": "It produces ATP.",
+                "choices": [
+                    {"choice_id": "q1-1-1", "choice_text": "Nucleus", "choice_explanation": "Holds DNA."},
+                    {"choice_id": "q1-1-2", "choice_text": "Mitochondria", "choice_explanation": "Makes ATP."},
+                ],
+            },
+        ],
+    }
+
+
+def test_strip_answers_removes_answers_explanations_and_metadata():
+    public_quiz = _strip_answers(make_quiz())
+
+    assert "metadata" not in public_quiz
+    question = public_quiz["questions"][0]
+    assert "correct_choice_id" not in question
+    assert "answer_explanation" not in question
+    assert question["choices"] == [
+        {"choice_id": "q1-1-1", "choice_text": "Nucleus"},
+        {"choice_id": "q1-1-2", "choice_text": "Mitochondria"},
+    ]
+
+
+def test_strip_answers_leaves_the_stored_quiz_untouched():
+    quiz = make_quiz()
+
+    _strip_answers(quiz)
+
+    assert quiz == make_quiz()
+
+
+def test_build_entry_maps_questions_by_id():
+    quiz = make_quiz()
+
+    entry = _build_entry(quiz)
+
+    assert entry["quiz"] is quiz
+    assert entry["question_map"] == {"q1-1": quiz["questions"][0]}
+    assert entry["public_quiz"] == _strip_answers(quiz)
+
+
+def test_build_entry_handles_a_quiz_without_questions():
+    entry = _build_entry({"quiz_id": "empty"})
+
+    assert entry["question_map"] == {}
+    assert entry["public_quiz"] == {"quiz_id": "empty", "questions": []}
@@ -0,0 +1,74 @@
+import asyncio
+import pytest
+from app.models.common_schemas import SourceTypes
+from app.services.single_flight import single_flight, get_source_key, get_single_flight_stats
+
+
+def test_source_key_normalizes_youtube_links_to_the_video_id():
+    keys = {
+        get_source_key(SourceTypes.YOUTUBE, "https://www.youtube.com/watch?v=dQw4w9WgXcQ"),
+        get_source_key(SourceTypes.YOUTUBE, " https://youtu.be/dQw4w9WgXcQ "),
+    }
+
+    assert keys == {"youtube:dQw4w9WgXcQ"}
+
+
+def test_source_key_ignores_host_case_and_fragment():
+    assert get_source_key(SourceTypes.ARTICLE, "HTTPS://Example.com/post?id=1#comments") == \
+        get_source_key(SourceTypes.ARTICLE, "https://example.com/post?id=1")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_fetch():
+    calls = 0
+    release = asyncio.Event()
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "transcript"
+
+    waiters = [asyncio.ensure_future(single_flight("test:shared", fetch)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*waiters) == ["transcript"] * 5
+    assert calls == 1
+    assert get_single_flight_stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_exceptions_reach_every_caller_and_the_key_is_released():
+    async def failing_fetch():
+        await asyncio.sleep(0)
+        raise ValueError("source unavailable")
+
+    results = await asyncio.gather(
+        single_flight("test:failing", failing_fetch), single_flight("test:failing", failing_fetch),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+    async def fetch():
+        return "retried"
+
+    assert await single_flight("test:failing", fetch) == "retried"
+
+
+@pytest.mark.asyncio
+async def test_a_cancelled_caller_does_not_cancel_the_shared_fetch():
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        return "done"
+
+    first = asyncio.ensure_future(single_flight("test:cancel", fetch))
+    second = asyncio.ensure_future(single_flight("test:cancel", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == "done"
@@ -0,0 +1,68 @@
+import pytest
+from app.services import task_registry
+from app.services.task_registry import get_compiled_task
+from app.services.token_budget import count_tokens
+from app.utils.summary import needs_chunking, count_content_tokens
+
+SENTENCE = "The lecture covers cell biology in depth. "
+
+
+def test_input_text_budget_subtracts_the_formatted_prompt():
+    task = get_compiled_task("summary_medium")
+
+    budget = task.input_text_budget(additional_instructions="Focus on dates.")
+
+    assert budget == task.input_token_budget - count_tokens(
+        task.format_prompt(input_text="", additional_instructions="Focus on dates.")
+    )
+
+
+@pytest.mark.asyncio
+async def test_content_is_counted_off_the_event_loop_with_the_same_result():
+    content = SENTENCE * 100
+
+    assert await count_content_tokens(content) == count_tokens(content)
+
+
+def test_content_that_fits_the_budget_is_summarized_in_one_call():
+    # Far past the old 48k-character threshold, well inside the Gemini budget
+    content = SENTENCE * 2000
+
+    assert len(content) > 48000
+    assert not needs_chunking(count_tokens(content), "summary_medium", additional_instructions="")
+
+
+def test_content_over_the_budget_is_chunked():
+    task = get_compiled_task("summary_medium")
+    content = SENTENCE * (task.input_token_budget // 4)
+
+    assert needs_chunking(count_tokens(content), "summary_medium", additional_instructions="")
+
+
+def test_the_budget_follows_the_task_model():
+    # summary_long runs on Groq, whose budget is much smaller than Gemini's
+    content_tokens = count_tokens(SENTENCE * 4000)
+
+    assert needs_chunking(content_tokens, "summary_long", additional_instructions="")
+    assert not needs_chunking(content_tokens, "summary_medium", additional_instructions="")
+
+
+def test_fit_prompt_reuses_a_known_input_count(monkeypatch):
+    task = get_compiled_task("summary_medium")
+    content = SENTENCE * 2000
+    content_tokens = count_tokens(content)
+    counted = []
+
+    def recording_count_tokens(text):
+        counted.append(len(text))
+        return count_tokens(text)
+
+    monkeypatch.setattr(task_registry, "count_tokens", recording_count_tokens)
+
+    prompt, stats = task.fit_prompt(input_tokens=content_tokens, input_text=content, additional_instructions="")
+
+    assert content in prompt
+    assert max(counted) < len(content)
+    assert stats["estimated_input_tokens"] == content_tokens + count_tokens(
+        task.format_prompt(input_text="", additional_instructions="")
+    )
@@ -0,0 +1,90 @@
+import pytest
+from app.services.token_budget import count_tokens, compress_to_budget, dedupe_units, strip_filler
+from app.services.task_registry import CompiledTask, get_compiled_task
+
+
+def make_task(budget):
+    return CompiledTask(
+        name="test_task",
+        template="Summarize this:\n\n{input_text}",
+        schema_name="raw_text",
+        model_config_name="gemini_flash_2_strict",
+        input_variables=["input_text"],
+        default_params={},
+        input_token_budget=budget,
+    )
+
+
+def lecture(sentences=400):
+    return " ".join(f"Point {i} explains how topic {i} relates to the lecture." for i in range(sentences))
+
+
+def test_count_tokens_of_empty_text_is_zero():
+    assert count_tokens("") == 0
+
+
+def test_dedupe_units_keeps_first_occurrence_ignoring_case_and_spacing():
+    assert dedupe_units(["Hello  world", "hello world", "Other"]) == ["Hello  world", "Other"]
+
+
+def test_strip_filler_removes_fillers_and_caption_cues():
+    assert strip_filler("[Music] um so, uh the cell [applause] divides") == "so, the cell divides"
+
+
+def test_compress_to_budget_returns_text_that_fits_unchanged():
+    text = "A short transcript."
+
+    assert compress_to_budget(text, 1000) is text
+
+
+@pytest.mark.parametrize("budget", [50, 300, 1000])
+def test_compress_to_budget_stays_within_budget(budget):
+    assert count_tokens(compress_to_budget(lecture(), budget)) <= budget
+
+
+def test_compress_to_budget_samples_the_whole_text():
+    compressed = compress_to_budget(lecture(), 1000)
+
+    # Sections are sampled across the input, so the end is represented, not just the start
+    assert "Point 0 " in compressed
+    assert any(f"Point {i} " in compressed for i in range(300, 400))
+
+
+def test_fit_prompt_leaves_a_prompt_within_budget_alone():
+    prompt, stats = make_task(1000).fit_prompt(input_text="A short transcript.")
+
+    assert prompt == "Summarize this:\n\nA short transcript."
+    assert stats == {"estimated_input_tokens": count_tokens(prompt), "input_compressed": False}
+
+
+def test_fit_prompt_compresses_input_over_budget():
+    prompt, stats = make_task(500).fit_prompt(input_text=lecture())
+
+    assert prompt.startswith("Summarize this:\n\n")
+    assert stats["input_compressed"] is True
+    assert stats["estimated_input_tokens"] <= 500
+    assert stats["original_input_tokens"] > 500
+
+
+def test_fit_prompt_without_budget_never_compresses():
+    _, stats = make_task(None).fit_prompt(input_text=lecture())
+
+    assert stats["input_compressed"] is False
+
+
+def test_fit_prompt_rejects_a_budget_smaller_than_the_template():
+    with pytest.raises(ValueError):
+        make_task(2).fit_prompt(input_text=lecture())
+
+
+def test_fit_prompt_never_compresses_the_user_instructions():
+    task = get_compiled_task("quiz_easy_general")
+    instructions = "Additional Instructions:\nOnly ask about the mitochondria section."
+
+    prompt, stats = task.fit_prompt(
+        input_text=lecture(20000), num_questions=5, additional_instructions=instructions
+    )
+
+    assert stats["input_compressed"] is True
+    assert stats["estimated_input_tokens"] <= task.input_token_budget
+    assert prompt.rstrip().endswith(instructions)
@@ -0,0 +1,104 @@
+import httpx
+import pytest
+from app.config import config
+from app.models.quiz import QuizCreate
+from app.services import youtube
+from app.services.youtube import get_transcript, TranscriptUnavailableError
+from app.utils import quiz_generator
+
+URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+
+def respond_with(status_code, json=None, error=None):
+    async def fake_fetch(method, url, **kwargs):
+        if error:
+            raise error
+        return httpx.Response(status_code, json=json)
+    return fake_fetch
+
+
+@pytest.mark.asyncio
+async def test_transcript_is_returned_on_success(monkeypatch):
+    monkeypatch.setattr(youtube, "fetch", respond_with(200, {"content": "hello"}))
+
+    assert await get_transcript(URL) == "hello"
+
+
+@pytest.mark.asyncio
+async def test_a_video_without_transcript_raises(monkeypatch):
+    monkeypatch.setattr(youtube, "fetch", respond_with(206, {"error": "transcript-unavailable"}))
+
+    with pytest.raises(TranscriptUnavailableError):
+        await get_transcript(URL)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fake_fetch", [
+    respond_with(500, {"error": "internal-error"}),
+    respond_with(401, {"error": "unauthorized"}),
+    respond_with(502),
+    respond_with(0, error=httpx.ReadTimeout("timed out")),
+])
+async def test_supadata_failures_are_not_a_missing_transcript(monkeypatch, fake_fetch):
+    monkeypatch.setattr(youtube, "fetch", fake_fetch)
+
+    assert await get_transcript(URL) is None
+
+
+def youtube_quiz():
+    return QuizCreate(quiz_source="youtube", difficulty="easy", content_source={"url": URL})
+
+
+@pytest.fixture
+def audio_calls(monkeypatch):
+    calls = []
+
+    async def fake_audio_quiz(quiz_data, source_url, start_time):
+        calls.append(source_url)
+        return {"quiz": {"questions": []}, "source_id": "dQw4w9WgXcQ", "metadata": {}}
+
+    monkeypatch.setattr(quiz_generator, "generate_audio_quiz", fake_audio_quiz)
+    monkeypatch.setattr(config, "QUIZ_AUDIO_FALLBACK", True)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_audio_fallback_runs_only_for_a_missing_transcript(monkeypatch, audio_calls):
+    async def no_transcript(quiz_source, source_url):
+        raise TranscriptUnavailableError("No transcript")
+
+    monkeypatch.setattr(quiz_generator, "get_source_content", no_transcript)
+
+    result = await quiz_generator.generate_quiz_2(youtube_quiz(), "u1")
+
+    assert audio_calls == [URL]
+    assert "error" not in result
+
+
+@pytest.mark.asyncio
+async def test_audio_fallback_skips_supadata_failures(monkeypatch, audio_calls):
+    async def supadata_down(quiz_source, source_url):
+        raise ValueError(f"Failed to get transcript for YouTube URL: {source_url}")
+
+    monkeypatch.setattr(quiz_generator, "get_source_content", supadata_down)
+
+    result = await quiz_generator.generate_quiz_2(youtube_quiz(), "u1")
+
+    assert audio_calls == []
+    assert "error" in result
+
+
+@pytest.mark.asyncio
+async def test_audio_fallback_is_off_by_default(monkeypatch, audio_calls):
+    assert type(config).model_fields["QUIZ_AUDIO_FALLBACK"].default is False
+    monkeypatch.setattr(config, "QUIZ_AUDIO_FALLBACK", False)
+
+    async def no_transcript(quiz_source, source_url):
+        raise TranscriptUnavailableError("No transcript")
+
+    monkeypatch.setattr(quiz_generator, "get_source_content", no_transcript)
+
+    result = await quiz_generator.generate_quiz_2(youtube_quiz(), "u1")
+
+    assert audio_calls == []
+    assert result == {"error": "No transcript"}
@@ -16,7 +16,16 @@ import { formatDate } from "@/lib/utils";
 export default function QuizAttempts() {
   const { quizId } = useParams<{ quizId: string }>();
   const navigate = useNavigate();
-  const { getQuizAttempts, quizAttempts, currentQuiz, getQuizById, isLoading } = useQuiz();
+  const {
+    getQuizAttempts,
+    loadMoreAttempts,
+    quizAttempts,
+    hasMoreAttempts,
+    currentQuiz,
+    getQuizById,
+    isLoading,
+    isLoadingMore,
+  } = useQuiz();
 
   useEffect(() => {
     if (quizId) {
@@ -113,6 +122,15 @@ export default function QuizAttempts() {
           ))}
         </TableBody>
       </Table>
+
+      {hasMoreAttempts && quizId && (
+        <div className="flex justify-center mt-4">
+          <Button variant="outline" onClick={() => loadMoreAttempts(quizId)} disabled={isLoadingMore}>
+            {isLoadingMore && <Loader2 className="mr-2 h-4 w-4 animate-spin" />}
+            Load More
+          </Button>
+        </div>
+      )}
       
       <div className="flex justify-end mt-8">
         <Button onClick={() => navigate(`/quiz/${quizId}`)}>
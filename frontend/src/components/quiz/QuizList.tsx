@@ -30,7 +30,16 @@ import { Badge } from "@/components/ui/badge";
 
 export default function QuizList() {
   const navigate = useNavigate();
-  const { quizzes, isLoading, error, getMyQuizzes, removeQuiz } = useQuiz();
+  const {
+    quizzes,
+    isLoading,
+    isLoadingMore,
+    hasMoreQuizzes,
+    error,
+    getMyQuizzes,
+    loadMoreQuizzes,
+    removeQuiz,
+  } = useQuiz();
   const [quizToDelete, setQuizToDelete] = useState<string | null>(null);
   const [deleteDialogOpen, setDeleteDialogOpen] = useState(false);
   
@@ -165,6 +174,15 @@ export default function QuizList() {
         ))}
       </div>
 
+      {hasMoreQuizzes && (
+        <div className="flex justify-center mt-6">
+          <Button variant="outline" onClick={() => loadMoreQuizzes()} disabled={isLoadingMore}>
+            {isLoadingMore && <Loader2 className="mr-2 h-4 w-4 animate-spin" />}
+            Load More
+          </Button>
+        </div>
+      )}
+
       <Dialog open={deleteDialogOpen} onOpenChange={setDeleteDialogOpen}>
         <DialogContent>
           <DialogHeader>
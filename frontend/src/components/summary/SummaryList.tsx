@@ -31,7 +31,16 @@ import dayjs from "dayjs";
 
 export default function SummaryList() {
   const navigate = useNavigate();
-  const { summaries, isLoading, error, getMySummaries, removeSummary } = useSummary();
+  const {
+    summaries,
+    isLoading,
+    isLoadingMore,
+    hasMoreSummaries,
+    error,
+    getMySummaries,
+    loadMoreSummaries,
+    removeSummary,
+  } = useSummary();
   const [summaryToDelete, setSummaryToDelete] = useState<string | null>(null);
   const [deleteDialogOpen, setDeleteDialogOpen] = useState(false);
   
@@ -159,6 +168,15 @@ export default function SummaryList() {
         </Table>
       </div>
 
+      {hasMoreSummaries && (
+        <div className="flex justify-center mt-4">
+          <Button variant="outline" onClick={() => loadMoreSummaries()} disabled={isLoadingMore}>
+            {isLoadingMore && <Loader2 className="mr-2 h-4 w-4 animate-spin" />}
+            Load More
+          </Button>
+        </div>
+      )}
+
       <Dialog open={deleteDialogOpen} onOpenChange={setDeleteDialogOpen}>
         <DialogContent>
           <DialogHeader>
@@ -4,8 +4,10 @@ import { toast } from "sonner";
 import { useState } from 'react';
 import { 
   fetchMyQuizzes, 
+  fetchMoreQuizzes,
   fetchQuizById,
   fetchQuizAttempts,
+  fetchMoreQuizAttempts,
   fetchQuizAttempt,
   submitQuizAttempt,
   createQuiz,
@@ -28,6 +30,9 @@ export const useQuiz = () => {
     currentQuiz, 
     quizResult, 
     quizAttempts,
+    quizzesCursor,
+    attemptsCursor,
+    isLoadingMore,
     isLoading: reduxIsLoading, 
     error: reduxError 
   } = useSelector((state: RootState) => state.quiz);
@@ -46,6 +51,19 @@ export const useQuiz = () => {
     }
   };
 
+  const loadMoreQuizzes = async () => {
+    if (!quizzesCursor) return false;
+    try {
+      await dispatch(fetchMoreQuizzes(quizzesCursor)).unwrap();
+      return true;
+    } catch (error) {
+      toast.error("Failed to fetch more quizzes", {
+        description: error as string || "Please try again later.",
+      });
+      return false;
+    }
+  };
+
   const getQuizById = async (quizId: string) => {
     try {
       await dispatch(fetchQuizById(quizId)).unwrap();
@@ -70,6 +88,19 @@ export const useQuiz = () => {
     }
   };
 
+  const loadMoreAttempts = async (quizId: string) => {
+    if (!attemptsCursor) return false;
+    try {
+      await dispatch(fetchMoreQuizAttempts({ quizId, cursor: attemptsCursor })).unwrap();
+      return true;
+    } catch (error) {
+      toast.error("Failed to fetch more quiz attempts", {
+        description: error as string || "Please try again later.",
+      });
+      return false;
+    }
+  };
+
   const getQuizAttempt = async (attemptId: string) => {
     try {
       await dispatch(fetchQuizAttempt(attemptId)).unwrap();
@@ -151,11 +182,16 @@ export const useQuiz = () => {
     currentQuiz,
     quizResult,
     quizAttempts,
+    hasMoreQuizzes: quizzesCursor !== null,
+    hasMoreAttempts: attemptsCursor !== null,
+    isLoadingMore,
     isLoading: reduxIsLoading || isLoading,
     error: reduxError || error,
     getMyQuizzes,
+    loadMoreQuizzes,
     getQuizById,
     getQuizAttempts,
+    loadMoreAttempts,
     getQuizAttempt,
     attemptQuiz,
     createNewQuiz,
@@ -3,6 +3,7 @@ import { useNavigate } from "react-router-dom";
 import { toast } from "sonner";
 import { 
   fetchMySummaries, 
+  fetchMoreSummaries,
   fetchSummaryById,
   createSummary as createSummaryAction,
   deleteSummary,
@@ -15,7 +16,7 @@ import { SummaryRequest } from "../types/summary.types";
 
 export const useSummary = () => {
   const dispatch = useDispatch();
-  const { summaries, currentSummary, isLoading, error } = useSelector(
+  const { summaries, summariesCursor, currentSummary, isLoading, isLoadingMore, error } = useSelector(
     (state: RootState) => state.summary
   );
 
@@ -31,6 +32,19 @@ export const useSummary = () => {
     }
   };
 
+  const loadMoreSummaries = async () => {
+    if (!summariesCursor) return false;
+    try {
+      await dispatch(fetchMoreSummaries(summariesCursor)).unwrap();
+      return true;
+    } catch (error) {
+      toast.error("Failed to fetch more summaries", {
+        description: error as string || "Please try again later.",
+      });
+      return false;
+    }
+  };
+
   const getSummaryById = async (summaryId: string) => {
     try {
       await dispatch(fetchSummaryById(summaryId)).unwrap();
@@ -86,9 +100,12 @@ export const useSummary = () => {
   return {
     summaries,
     currentSummary,
+    hasMoreSummaries: summariesCursor !== null,
     isLoading,
+    isLoadingMore,
     error,
     getMySummaries,
+    loadMoreSummaries,
     getSummaryById,
     createSummary,
     removeSummary,
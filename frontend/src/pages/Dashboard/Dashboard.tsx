@@ -8,8 +8,8 @@ import { useSummary } from "@/hooks/useSummary";
 
 export default function Dashboard() {
   const navigate = useNavigate();
-  const { quizzes, getMyQuizzes, isLoading: quizLoading } = useQuiz();
-  const { summaries, getMySummaries, isLoading: summaryLoading } = useSummary();
+  const { quizzes, hasMoreQuizzes, getMyQuizzes, isLoading: quizLoading } = useQuiz();
+  const { summaries, hasMoreSummaries, getMySummaries, isLoading: summaryLoading } = useSummary();
   
   useEffect(() => {
     getMyQuizzes();
@@ -36,7 +36,7 @@ export default function Dashboard() {
                 <p className="text-muted-foreground">Loading quizzes...</p>
               ) : quizzes && quizzes.length > 0 ? (
                 <div>
-                  <p className="text-muted-foreground mb-3">You have {quizzes.length} quizzes</p>
+                  <p className="text-muted-foreground mb-3">You have {quizzes.length}{hasMoreQuizzes && "+"} quizzes</p>
                   <Button variant="outline" onClick={() => navigate("/quiz/myquizzes")} className="w-full">
                     <BookOpen className="h-4 w-4 mr-2" /> View All Quizzes
                   </Button>
@@ -68,7 +68,7 @@ export default function Dashboard() {
                 <p className="text-muted-foreground">Loading summaries...</p>
               ) : summaries && summaries.length > 0 ? (
                 <div>
-                  <p className="text-muted-foreground mb-3">You have {summaries.length} summaries</p>
+                  <p className="text-muted-foreground mb-3">You have {summaries.length}{hasMoreSummaries && "+"} summaries</p>
                   <Button variant="outline" onClick={() => navigate("/summary/mysummaries")} className="w-full">
                     <FileText className="h-4 w-4 mr-2" /> View All Summaries
                   </Button>
@@ -2,9 +2,12 @@ import axiosInstance from "../utils/axisConfig.ts";
 import { Quiz, QuizAttemptRequest, QuizResult } from "../types/quiz.types";
 
 export const quizService = {
-  // Get all quizzes for current user
-  getMyQuizzes: async (): Promise<{ quizzes: Quiz[] }> => {
-    const response = await axiosInstance.get<{ quizzes: Quiz[] }>("/quiz/myquizzes");
+  // Get one page of the current user's quizzes; pass next_cursor to get the following page
+  getMyQuizzes: async (cursor?: string): Promise<{ quizzes: Quiz[]; next_cursor: string | null }> => {
+    const response = await axiosInstance.get<{ quizzes: Quiz[]; next_cursor: string | null }>(
+      "/quiz/myquizzes",
+      { params: cursor ? { cursor } : undefined }
+    );
     return response.data;
   },
   
@@ -29,10 +32,14 @@ export const quizService = {
     return response.data;
   },
   
-  // Get quiz attempts for a specific quiz
-  getQuizAttempts: async (quizId: string): Promise<{ attempts: any[] }> => {
-    const response = await axiosInstance.get<{ attempts: any[] }>(
-      `/quiz/${quizId}/attempts`
+  // Get one page of attempts for a specific quiz; pass next_cursor to get the following page
+  getQuizAttempts: async (
+    quizId: string,
+    cursor?: string
+  ): Promise<{ attempts: any[]; next_cursor: string | null }> => {
+    const response = await axiosInstance.get<{ attempts: any[]; next_cursor: string | null }>(
+      `/quiz/${quizId}/attempts`,
+      { params: cursor ? { cursor } : undefined }
     );
     return response.data;
   },
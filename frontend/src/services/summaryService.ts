@@ -2,9 +2,12 @@ import axiosInstance from "../utils/axisConfig";
 import { Summary, SummaryRequest, SummaryResponse } from "../types/summary.types";
 
 export const summaryService = {
-  // Get all summaries for current user
-  getMySummaries: async (): Promise<{ summaries: Summary[] }> => {
-    const response = await axiosInstance.get<{ summaries: Summary[] }>("/summary/mysummaries");
+  // Get one page of the current user's summaries; pass next_cursor to get the following page
+  getMySummaries: async (cursor?: string): Promise<{ summaries: Summary[]; next_cursor: string | null }> => {
+    const response = await axiosInstance.get<{ summaries: Summary[]; next_cursor: string | null }>(
+      "/summary/mysummaries",
+      { params: cursor ? { cursor } : undefined }
+    );
     return response.data;
   },
   
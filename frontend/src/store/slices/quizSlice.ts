@@ -7,7 +7,10 @@ interface QuizState {
   currentQuiz: Quiz | null;
   quizResult: QuizResult | null;
   quizAttempts: any[]; // using any[] for attempts; update type as needed.
+  quizzesCursor: string | null;
+  attemptsCursor: string | null;
   isLoading: boolean;
+  isLoadingMore: boolean;
   error: string | null;
 }
 
@@ -16,7 +19,10 @@ const initialState: QuizState = {
   currentQuiz: null,
   quizResult: null,
   quizAttempts: [],
+  quizzesCursor: null,
+  attemptsCursor: null,
   isLoading: false,
+  isLoadingMore: false,
   error: null,
 };
 
@@ -25,8 +31,18 @@ export const fetchMyQuizzes = createAsyncThunk(
   "quiz/fetchMyQuizzes",
   async (_, { rejectWithValue }) => {
     try {
-      const response = await quizService.getMyQuizzes();
-      return response.quizzes;
+      return await quizService.getMyQuizzes();
+    } catch (error: any) {
+      return rejectWithValue(error.response?.data?.detail || "Failed to fetch quizzes");
+    }
+  }
+);
+
+export const fetchMoreQuizzes = createAsyncThunk(
+  "quiz/fetchMoreQuizzes",
+  async (cursor: string, { rejectWithValue }) => {
+    try {
+      return await quizService.getMyQuizzes(cursor);
     } catch (error: any) {
       return rejectWithValue(error.response?.data?.detail || "Failed to fetch quizzes");
     }
@@ -86,8 +102,20 @@ export const fetchQuizAttempts = createAsyncThunk(
   "quiz/fetchQuizAttempts",
   async (quizId: string, { rejectWithValue }) => {
     try {
-      const response = await quizService.getQuizAttempts(quizId);
-      return response.attempts;
+      return await quizService.getQuizAttempts(quizId);
+    } catch (error: any) {
+      return rejectWithValue(
+        error.response?.data?.detail || "Failed to fetch quiz attempts"
+      );
+    }
+  }
+);
+
+export const fetchMoreQuizAttempts = createAsyncThunk(
+  "quiz/fetchMoreQuizAttempts",
+  async ({ quizId, cursor }: { quizId: string; cursor: string }, { rejectWithValue }) => {
+    try {
+      return await quizService.getQuizAttempts(quizId, cursor);
     } catch (error: any) {
       return rejectWithValue(
         error.response?.data?.detail || "Failed to fetch quiz attempts"
@@ -146,12 +174,26 @@ const quizSlice = createSlice({
     });
     builder.addCase(fetchMyQuizzes.fulfilled, (state, action) => {
       state.isLoading = false;
-      state.quizzes = action.payload;
+      state.quizzes = action.payload.quizzes;
+      state.quizzesCursor = action.payload.next_cursor;
     });
     builder.addCase(fetchMyQuizzes.rejected, (state, action) => {
       state.isLoading = false;
       state.error = action.payload as string;
     });
+
+    // Fetch the next page of quizzes, keeping the ones already shown
+    builder.addCase(fetchMoreQuizzes.pending, (state) => {
+      state.isLoadingMore = true;
+    });
+    builder.addCase(fetchMoreQuizzes.fulfilled, (state, action) => {
+      state.isLoadingMore = false;
+      state.quizzes = [...state.quizzes, ...action.payload.quizzes];
+      state.quizzesCursor = action.payload.next_cursor;
+    });
+    builder.addCase(fetchMoreQuizzes.rejected, (state) => {
+      state.isLoadingMore = false;
+    });
     
     // Fetch Quiz By Id
     builder.addCase(fetchQuizById.pending, (state) => {
@@ -215,12 +257,25 @@ const quizSlice = createSlice({
     });
     builder.addCase(fetchQuizAttempts.fulfilled, (state, action) => {
       state.isLoading = false;
-      state.quizAttempts = action.payload;
+      state.quizAttempts = action.payload.attempts;
+      state.attemptsCursor = action.payload.next_cursor;
     });
     builder.addCase(fetchQuizAttempts.rejected, (state, action) => {
       state.isLoading = false;
       state.error = action.payload as string;
     });
+
+    builder.addCase(fetchMoreQuizAttempts.pending, (state) => {
+      state.isLoadingMore = true;
+    });
+    builder.addCase(fetchMoreQuizAttempts.fulfilled, (state, action) => {
+      state.isLoadingMore = false;
+      state.quizAttempts = [...state.quizAttempts, ...action.payload.attempts];
+      state.attemptsCursor = action.payload.next_cursor;
+    });
+    builder.addCase(fetchMoreQuizAttempts.rejected, (state) => {
+      state.isLoadingMore = false;
+    });
     
     builder.addCase(fetchQuizAttempt.pending, (state) => {
       state.isLoading = true;
@@ -5,14 +5,18 @@ import { Summary, SummaryRequest, SummaryResponse } from "../../types/summary.ty
 interface SummaryState {
   summaries: Summary[];
   currentSummary: Summary | null;
+  summariesCursor: string | null;
   isLoading: boolean;
+  isLoadingMore: boolean;
   error: string | null;
 }
 
 const initialState: SummaryState = {
   summaries: [],
   currentSummary: null,
+  summariesCursor: null,
   isLoading: false,
+  isLoadingMore: false,
   error: null,
 };
 
@@ -21,8 +25,18 @@ export const fetchMySummaries = createAsyncThunk(
   "summary/fetchMySummaries",
   async (_, { rejectWithValue }) => {
     try {
-      const response = await summaryService.getMySummaries();
-      return response.summaries;
+      return await summaryService.getMySummaries();
+    } catch (error: any) {
+      return rejectWithValue(error.response?.data?.detail || "Failed to fetch summaries");
+    }
+  }
+);
+
+export const fetchMoreSummaries = createAsyncThunk(
+  "summary/fetchMoreSummaries",
+  async (cursor: string, { rejectWithValue }) => {
+    try {
+      return await summaryService.getMySummaries(cursor);
     } catch (error: any) {
       return rejectWithValue(error.response?.data?.detail || "Failed to fetch summaries");
     }
@@ -87,12 +101,26 @@ const summarySlice = createSlice({
     });
     builder.addCase(fetchMySummaries.fulfilled, (state, action) => {
       state.isLoading = false;
-      state.summaries = action.payload;
+      state.summaries = action.payload.summaries;
+      state.summariesCursor = action.payload.next_cursor;
     });
     builder.addCase(fetchMySummaries.rejected, (state, action) => {
       state.isLoading = false;
       state.error = action.payload as string;
     });
+
+    // Fetch the next page of summaries, keeping the ones already shown
+    builder.addCase(fetchMoreSummaries.pending, (state) => {
+      state.isLoadingMore = true;
+    });
+    builder.addCase(fetchMoreSummaries.fulfilled, (state, action) => {
+      state.isLoadingMore = false;
+      state.summaries = [...state.summaries, ...action.payload.summaries];
+      state.summariesCursor = action.payload.next_cursor;
+    });
+    builder.addCase(fetchMoreSummaries.rejected, (state) => {
+      state.isLoadingMore = false;
+    });
     
     // Fetch Summary By Id
     builder.addCase(fetchSummaryById.pending, (state) => {